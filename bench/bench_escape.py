@@ -0,0 +1,87 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import htmlnode  # noqa: E402
+import LeafNode  # noqa: E402
+from block import markdown_to_html_node  # noqa: E402
+from corpus import generate_corpus  # noqa: E402
+from fragments import configure  # noqa: E402
+
+
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def escaped_values(pages):
+    texts = []
+    attrs = []
+    escape_text, escape_attr = LeafNode.escape_text, htmlnode.escape_attr
+
+    def record_text(value):
+        texts.append(value)
+        return escape_text(value)
+
+    def record_attr(value):
+        attrs.append(value)
+        return escape_attr(value)
+
+    LeafNode.escape_text, htmlnode.escape_attr = record_text, record_attr
+    try:
+        for markdown in pages:
+            markdown_to_html_node(markdown).to_html()
+    finally:
+        LeafNode.escape_text, htmlnode.escape_attr = escape_text, escape_attr
+    return texts, attrs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Cost of HTML escaping relative to rendering")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--inline-cache-size", type=int, default=0, metavar="N",
+                        help="enable the inline fragment cache; by default it "
+                             "is off so every leaf is escaped")
+    parser.add_argument("--budget", type=float, default=0.05,
+                        help="allowed share of render time spent escaping")
+    args = parser.parse_args(argv)
+
+    configure(args.inline_cache_size)
+    pages = [markdown for _, markdown in generate_corpus(args.pages, args.seed)]
+    texts, attrs = escaped_values(pages)
+    escape_text, escape_attr = LeafNode.escape_text, htmlnode.escape_attr
+
+    def render():
+        for markdown in pages:
+            markdown_to_html_node(markdown).to_html()
+
+    def escape():
+        for value in texts:
+            escape_text(value)
+        for value in attrs:
+            escape_attr(value)
+
+    render_seconds = best_of(render, args.repeat)
+    escape_seconds = best_of(escape, args.repeat)
+    share = escape_seconds / render_seconds
+
+    print(f"{args.pages} pages, {len(texts)} text values, {len(attrs)} attributes, "
+          f"best of {args.repeat}")
+    print(f"{'render':<16} {render_seconds * 1000:9.1f} ms")
+    print(f"{'escaping':<16} {escape_seconds * 1000:9.1f} ms")
+    print(f"{'escaping share':<16} {share * 100:8.1f} % (budget {args.budget * 100:.0f} %)")
+    return 1 if share > args.budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tracemalloc
+
+from corpus import generate_markdown
+
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+def max_rss_bytes():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def child(src_dir, path, trace):
+    sys.path.insert(0, src_dir)
+    from block import markdown_to_html_node
+
+    with open(path) as f:
+        markdown = f.read()
+    rss_before = max_rss_bytes()
+    if trace:
+        tracemalloc.start()
+    node = markdown_to_html_node(markdown)
+    result = {"rss_before": rss_before, "rss_peak": max_rss_bytes()}
+    if trace:
+        result["traced_peak"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    del node
+    print(json.dumps(result))
+
+
+def measure(src_dir, path, trace):
+    args = [sys.executable, os.path.abspath(__file__), "--child", src_dir, path]
+    if trace:
+        args.append("--trace")
+    out = subprocess.run(args, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Peak memory of markdown_to_html_node per MB of markdown. "
+        "Pass --src several times (e.g. a git worktree of an older commit) "
+        "to compare implementations.")
+    parser.add_argument("--src", action="append",
+                        help="source directory to import block.py from")
+    parser.add_argument("--size-mb", type=float, default=1.0)
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    parser.add_argument("--trace", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child(args.child[0], args.child[1], args.trace)
+        return
+
+    markdown = generate_markdown(int(args.size_mb * 1_000_000))
+    size_mb = len(markdown.encode()) / 1e6
+    path = os.path.join(os.environ.get("TMPDIR", "/tmp"), "bench_memory.md")
+    with open(path, "w") as f:
+        f.write(markdown)
+
+    print(f"corpus: {size_mb:.2f} MB of markdown")
+    for src_dir in args.src or [SRC_DIR]:
+        rss = measure(src_dir, path, trace=False)
+        traced = measure(src_dir, path, trace=True)
+        rss_growth = (rss["rss_peak"] - rss["rss_before"]) / 1e6 / size_mb
+        traced_peak = traced["traced_peak"] / 1e6 / size_mb
+        print(f"{src_dir}\n"
+              f"  peak RSS growth: {rss_growth:7.1f} MB per MB of markdown\n"
+              f"  traced peak:     {traced_peak:7.1f} MB per MB of markdown")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
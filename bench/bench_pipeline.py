@@ -0,0 +1,175 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from block import (  # noqa: E402
+    block_to_block_type,
+    block_type_code,
+    block_type_heading,
+    block_type_olist,
+    block_type_quote,
+    block_type_ulist,
+    markdown_to_blocks,
+    markdown_to_html_node,
+)
+from corpus import KINDS, generate_corpus  # noqa: E402
+from fragments import inline_cache  # noqa: E402
+from inline import text_to_textnodes  # noqa: E402
+
+
+def inline_texts(markdown):
+    texts = []
+    for block in markdown_to_blocks(markdown):
+        block_type = block_to_block_type(block)
+        lines = block.split("\n")
+        if block_type == block_type_code:
+            continue
+        if block_type == block_type_heading:
+            texts.append(block.lstrip("#").strip())
+        elif block_type == block_type_ulist:
+            texts.extend(line[2:] for line in lines)
+        elif block_type == block_type_olist:
+            texts.extend(line.split(". ", 1)[1] for line in lines)
+        elif block_type == block_type_quote:
+            texts.append(" ".join(line.lstrip(">").strip() for line in lines))
+        else:
+            texts.append(" ".join(lines))
+    return texts
+
+
+def stages(corpus):
+    pages = [markdown for _, markdown in corpus]
+    texts = [inline_texts(markdown) for markdown in pages]
+    nodes = [markdown_to_html_node(markdown) for markdown in pages]
+
+    def blocks():
+        for markdown in pages:
+            markdown_to_blocks(markdown)
+
+    def inline():
+        for page_texts in texts:
+            for text in page_texts:
+                text_to_textnodes(text)
+
+    def html_node():
+        for markdown in pages:
+            markdown_to_html_node(markdown)
+
+    def to_html():
+        for node in nodes:
+            node.to_html()
+
+    def pipeline():
+        for markdown in pages:
+            markdown_to_html_node(markdown).to_html()
+
+    return {
+        "markdown_to_blocks": blocks,
+        "text_to_textnodes": inline,
+        "markdown_to_html_node": html_node,
+        "to_html": to_html,
+        "pipeline": pipeline,
+    }
+
+
+def time_stage(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        inline_cache.clear()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func):
+    inline_cache.clear()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def run(pages, seed, repeat, kinds=KINDS):
+    corpus = generate_corpus(pages, seed, kinds)
+    size = sum(len(markdown.encode()) for _, markdown in corpus)
+    results = {}
+    for name, func in stages(corpus).items():
+        seconds = time_stage(func, repeat)
+        results[name] = {
+            "seconds": seconds,
+            "pages_per_sec": pages / seconds,
+            "mb_per_sec": size / 1e6 / seconds,
+            "peak_bytes": peak_memory(func),
+        }
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {"pages": pages, "bytes": size, "seed": seed,
+                   "kinds": list(kinds)},
+        "repeat": repeat,
+        "stages": results,
+    }
+
+
+def compare(report, baseline, threshold):
+    regressions = []
+    for name, result in report["stages"].items():
+        before = baseline["stages"].get(name)
+        if before is None:
+            continue
+        ratio = result["seconds"] / before["seconds"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<24} {ratio:6.2f}x baseline time{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Markdown pipeline benchmark")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--kind", action="append", choices=KINDS,
+                        help="only generate pages of this kind (repeatable)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown before a stage counts as a regression")
+    args = parser.parse_args(argv)
+
+    report = run(args.pages, args.seed, args.repeat, tuple(args.kind or KINDS))
+    corpus = report["corpus"]
+    print(f"{corpus['pages']} pages, {corpus['bytes'] / 1e6:.2f} MB, "
+          f"best of {args.repeat}")
+    for name, result in report["stages"].items():
+        print(f"{name:<24} {result['seconds'] * 1000:9.1f} ms "
+              f"{result['pages_per_sec']:9.0f} pages/s "
+              f"{result['mb_per_sec']:7.2f} MB/s "
+              f"{result['peak_bytes'] / 1e6:8.1f} MB peak")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from corpus import generate_corpus
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+MAIN = os.path.join(SRC, "main.py")
+
+
+def import_times(command):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *command],
+        capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative) / 1000
+    return modules
+
+
+def cold_render(command, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *command], check=True,
+                       stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Cold-start budget check for rendering a single page")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10,
+                        help="number of slowest imports to list")
+    parser.add_argument("--import-budget-ms", type=float, default=50.0,
+                        help="allowed cumulative import time of main.py")
+    parser.add_argument("--render-budget-ms", type=float, default=200.0,
+                        help="allowed wall time of a cold render-one run")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as root:
+        source = os.path.join(root, "page.md")
+        template = os.path.join(root, "template.html")
+        with open(source, "w") as f:
+            f.write(generate_corpus(1)[0][1])
+        with open(template, "w") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+        command = [MAIN, "render-one", source, "-t", template]
+
+        modules = import_times(["-c", f"import sys; sys.path.insert(0, {SRC!r}); "
+                                      "import main"])
+        render_ms = cold_render(command, args.repeat)
+
+    import_ms = modules.get("main", 0.0)
+    print(f"{'import main':<24} {import_ms:9.1f} ms (budget {args.import_budget_ms:.0f} ms)")
+    print(f"{'cold render-one':<24} {render_ms:9.1f} ms (budget {args.render_budget_ms:.0f} ms)")
+    slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)
+    for name, ms in slowest[1:args.top + 1]:
+        print(f"  {name:<22} {ms:9.1f} ms")
+
+    over = []
+    if import_ms > args.import_budget_ms:
+        over.append("import")
+    if render_ms > args.render_budget_ms:
+        over.append("render-one")
+    if over:
+        print(f"over budget: {', '.join(over)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import random
+
+
+WORDS = (
+    "the quick brown fox jumps over lazy dog static site generator markdown "
+    "page template content build render output paragraph sentence node tree "
+    "block inline parser token stream cache index link image list quote code"
+).split()
+
+KINDS = ("prose", "links", "lists", "code", "quotes")
+
+
+def sentence(rng, low=8, high=20, markup=0.0):
+    words = []
+    for _ in range(rng.randint(low, high)):
+        word = rng.choice(WORDS)
+        if rng.random() < markup:
+            word = rng.choice((
+                f"**{word}**", f"*{word}*", f"`{word}`",
+                f"[{word}](/docs/{word}.html)",
+            ))
+        words.append(word)
+    return " ".join(words).capitalize() + "."
+
+
+def prose_block(rng, markup=0.05):
+    return " ".join(sentence(rng, markup=markup) for _ in range(rng.randint(3, 8)))
+
+
+def link_block(rng):
+    parts = []
+    for _ in range(rng.randint(20, 60)):
+        word = rng.choice(WORDS)
+        if rng.random() < 0.1:
+            parts.append(f"![{word}](/images/{word}.png)")
+        else:
+            parts.append(f"[{word}](/{rng.choice(WORDS)}/{word}.html)")
+        parts.append(rng.choice(WORDS))
+    return " ".join(parts)
+
+
+def list_block(rng, items=None):
+    items = items or rng.randint(50, 300)
+    if rng.random() < 0.5:
+        return "\n".join(f"* {sentence(rng, 3, 10, 0.1)}" for _ in range(items))
+    return "\n".join(f"{i}. {sentence(rng, 3, 10, 0.1)}" for i in range(1, items + 1))
+
+
+def code_block(rng, lines=None):
+    lines = lines or rng.randint(50, 400)
+    body = []
+    for i in range(lines):
+        indent = "    " * rng.randint(0, 3)
+        body.append(f"{indent}{rng.choice(WORDS)}_{i} = {rng.choice(WORDS)}({i}) + {i}")
+    return "```\n" + "\n".join(body) + "\n```"
+
+
+def quote_block(rng):
+    lines = []
+    depth = 1
+    for _ in range(rng.randint(5, 40)):
+        if rng.random() < 0.2:
+            depth = max(1, min(3, depth + rng.choice((-1, 1))))
+        lines.append(f"{'> ' * depth}{sentence(rng, 6, 16, 0.05)}")
+    return "\n".join(lines)
+
+
+BLOCKS = {
+    "prose": prose_block,
+    "links": link_block,
+    "lists": list_block,
+    "code": code_block,
+    "quotes": quote_block,
+}
+
+
+def generate_page(kind, rng, blocks=None):
+    make = BLOCKS[kind]
+    parts = [f"# {sentence(rng, 2, 6).rstrip('.')}"]
+    for _ in range(blocks or rng.randint(6, 16)):
+        parts.append(make(rng) if rng.random() < 0.7 else prose_block(rng))
+    return "\n\n".join(parts) + "\n"
+
+
+def generate_corpus(pages, seed=0, kinds=KINDS):
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(pages):
+        kind = kinds[i % len(kinds)]
+        corpus.append((f"{kind}-{i}.md", generate_page(kind, rng)))
+    return corpus
+
+
+def generate_markdown(size, seed=0, kinds=KINDS):
+    rng = random.Random(seed)
+    parts = [f"# {sentence(rng, 2, 6).rstrip('.')}"]
+    total = 0
+    i = 0
+    while total < size:
+        block = BLOCKS[kinds[i % len(kinds)]](rng)
+        parts.append(block)
+        total += len(block) + 2
+        i += 1
+    return "\n\n".join(parts) + "\n"
+
+
+def prose_paragraphs(paragraphs, markup_ratio, seed=0):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(paragraphs):
+        markup = 0.05 if rng.random() < markup_ratio else 0.0
+        corpus.append(prose_block(rng, markup))
+    return corpus
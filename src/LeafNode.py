@@ -1,13 +1,16 @@
-from htmlnode import HTMLNode
+from htmlnode import HTMLNode, EMPTY_CHILDREN
+from escaping import escape_text
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag = None, value = None, props = None):
-        super().__init__(tag=tag, value=value, children=[], props=props)
+        super().__init__(tag=tag, value=value, children=EMPTY_CHILDREN, props=props)
         if self.value == None: raise ValueError("add value")
         
 
     def to_html(self):
         if self.value == None: raise ValueError("add value")
-        if self.tag == None: return self.value
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+        if self.tag == None: return escape_text(self.value)
+        return f"<{self.tag}{self.props_to_html()}>{escape_text(self.value)}</{self.tag}>"
 
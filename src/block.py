@@ -1,6 +1,9 @@
+from escaping import Markup
 from textnode import text_node_to_html_node
 from parentnode import ParentNode
+from LeafNode import LeafNode
 from inline import text_to_textnodes
+from fragments import inline_cache
 
 
 block_type_paragraph = "paragraph"
@@ -10,77 +13,134 @@ block_type_quote = "quote"
 block_type_olist = "ordered_list"
 block_type_ulist = "unordered_list"
 
+FENCE = "```"
+HEADING_PREFIXES = ("# ", "## ", "### ", "#### ", "##### ", "###### ")
+
 
 def markdown_to_blocks(markdown):
+    if FENCE in markdown:
+        return list(iter_blocks(markdown.split("\n")))
     blocks = markdown.split("\n\n")
     filtered_blocks = []
     for block in blocks:
+        block = block.strip()
         if block == "":
             continue
-        block = block.strip()
         filtered_blocks.append(block)
     return filtered_blocks
 
 
-def block_to_block_type(block):
+def iter_blocks(lines, fences=True):
+    block = []
+    closing = None
+    for line in lines:
+        if line.endswith("\n"):
+            line = line[:-1]
+        if closing is not None:
+            block.append(line)
+            if line.startswith(closing) or line.startswith(FENCE):
+                closing = None
+                yield "\n".join(block).strip()
+                block = []
+        elif line == "":
+            if block:
+                text = "\n".join(block).strip()
+                if text:
+                    yield text
+                block = []
+        else:
+            if fences and not block:
+                opener = line.lstrip()
+                if opener.startswith(FENCE) and FENCE not in opener[len(FENCE):]:
+                    closing = line[:len(line) - len(opener)] + FENCE
+            block.append(line)
+    if closing is not None:
+        yield from iter_blocks(block, fences=False)
+    elif block:
+        text = "\n".join(block).strip()
+        if text:
+            yield text
+
+
+def iter_typed_blocks(lines):
+    for block in iter_blocks(lines):
+        yield block_to_block_type(block), block
+
+
+def classify_block(block):
+    first = block[:1]
+    if first == "`":
+        last = block.rfind("\n")
+        if (last != -1 and block.startswith(FENCE)
+                and block[last + 1:].lstrip().startswith(FENCE)):
+            return block_type_code, None
     lines = block.split("\n")
-
-    if block.startswith(("# ", "## ", "### ", "#### ", "##### ", "###### ")):
-        return block_type_heading
-    if len(lines) > 1 and lines[0].startswith("```") and lines[-1].startswith("```"):
-        return block_type_code
-    if block.startswith(">"):
+    if first == "#":
+        if block.startswith(HEADING_PREFIXES):
+            return block_type_heading, lines
+    elif first == ">":
         for line in lines:
             if not line.startswith(">"):
-                return block_type_paragraph
-        return block_type_quote
-    if block.startswith("* "):
+                return block_type_paragraph, lines
+        return block_type_quote, lines
+    elif first in ("*", "-"):
+        prefix = first + " "
         for line in lines:
-            if not line.startswith("* "):
-                return block_type_paragraph
-        return block_type_ulist
-    if block.startswith("- "):
-        for line in lines:
-            if not line.startswith("- "):
-                return block_type_paragraph
-        return block_type_ulist
-    if block.startswith("1. "):
+            if not line.startswith(prefix):
+                return block_type_paragraph, lines
+        return block_type_ulist, lines
+    elif first == "1":
         i = 1
         for line in lines:
-            if not line.startswith(f"{i}. "):
-                return block_type_paragraph
+            number = str(i)
+            if not (line.startswith(number) and line.startswith(". ", len(number))):
+                return block_type_paragraph, lines
             i += 1
-        return block_type_olist
-    return block_type_paragraph
+        return block_type_olist, lines
+    return block_type_paragraph, lines
+
+
+def block_to_block_type(block):
+    return classify_block(block)[0]
 
 
 def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
+    if isinstance(markdown, str):
+        blocks = markdown_to_blocks(markdown)
+    else:
+        blocks = iter_blocks(markdown)
     children = []
     for block in blocks:
-        html_node = block_to_html_node(block)
-        children.append(html_node)
+        block_type, lines = classify_block(block)
+        children.append(BLOCK_CONVERTERS[block_type](block, lines))
     return ParentNode("div", children, None)
 
 
-def block_to_html_node(block):
-    block_type = block_to_block_type(block)
-    if block_type == block_type_paragraph:
-        return paragraph_to_html_node(block)
-    if block_type == block_type_heading:
-        return heading_to_html_node(block)
-    if block_type == block_type_code:
-        return code_to_html_node(block)
-    if block_type == block_type_olist:
-        return olist_to_html_node(block)
-    if block_type == block_type_ulist:
-        return ulist_to_html_node(block)
-    if block_type == block_type_quote:
-        return quote_to_html_node(block)
-    raise ValueError("Invalid block type")
+def block_to_html_node(block, block_type=None):
+    lines = None
+    if block_type is None:
+        block_type, lines = classify_block(block)
+    converter = BLOCK_CONVERTERS.get(block_type)
+    if converter is None:
+        raise ValueError("Invalid block type")
+    return converter(block, lines)
 
 
 def text_to_children(text):
+    if inline_cache.maxsize <= 0:
+        return text_to_nodes(text)
+    html = inline_cache.get(text)
+    if html is None:
+        children = text_to_nodes(text)
+        if not inline_cache.admit(text) or any(
+                child.tag in ("a", "img") for child in children):
+            return children
+        html = Markup("".join(node.to_html() for node in children))
+        inline_cache.put(text, html)
+    return [LeafNode(None, html)]
+
+
+def text_to_nodes(text):
     text_nodes = text_to_textnodes(text)
     children = []
     for text_node in text_nodes:
@@ -89,14 +149,15 @@ def text_to_children(text):
     return children
 
 
-def paragraph_to_html_node(block):
-    lines = block.split("\n")
+def paragraph_to_html_node(block, lines=None):
+    if lines is None:
+        lines = block.split("\n")
     paragraph = " ".join(lines)
     children = text_to_children(paragraph)
     return ParentNode("p", children)
 
 
-def heading_to_html_node(block):
+def heading_to_html_node(block, lines=None):
     level = 0
     for char in block:
         if char == "#":
@@ -110,17 +171,21 @@ def heading_to_html_node(block):
     return ParentNode(f"h{level}", children)
 
 
-def code_to_html_node(block):
-    if not block.startswith("```") or not block.endswith("```"):
+def code_to_html_node(block, lines=None):
+    if not block.startswith(FENCE) or not block.endswith(FENCE):
         raise ValueError("Invalid code block")
-    text = block[4:-3]
-    children = text_to_children(text)
-    code = ParentNode("code", children)
+    start = block.find("\n")
+    end = block.rfind("\n")
+    if start == -1 or end < start:
+        raise ValueError("Invalid code block")
+    info = block[len(FENCE):start].split()
+    props = {"class": f"language-{info[0]}"} if info else None
+    code = LeafNode("code", block[start + 1:end + 1], props)
     return ParentNode("pre", [code])
 
 
-def olist_to_html_node(block):
-    items = block.split("\n")
+def olist_to_html_node(block, lines=None):
+    items = lines if lines is not None else block.split("\n")
     html_items = []
     for item in items:
         text = item[3:]
@@ -129,8 +194,8 @@ def olist_to_html_node(block):
     return ParentNode("ol", html_items)
 
 
-def ulist_to_html_node(block):
-    items = block.split("\n")
+def ulist_to_html_node(block, lines=None):
+    items = lines if lines is not None else block.split("\n")
     html_items = []
     for item in items:
         text = item[2:]
@@ -139,8 +204,9 @@ def ulist_to_html_node(block):
     return ParentNode("ul", html_items)
 
 
-def quote_to_html_node(block):
-    lines = block.split("\n")
+def quote_to_html_node(block, lines=None):
+    if lines is None:
+        lines = block.split("\n")
     new_lines = []
     for line in lines:
         if not line.startswith(">"):
@@ -149,3 +215,13 @@ def quote_to_html_node(block):
     content = " ".join(new_lines)
     children = text_to_children(content)
     return ParentNode("blockquote", children)
+
+
+BLOCK_CONVERTERS = {
+    block_type_paragraph: paragraph_to_html_node,
+    block_type_heading: heading_to_html_node,
+    block_type_code: code_to_html_node,
+    block_type_quote: quote_to_html_node,
+    block_type_olist: olist_to_html_node,
+    block_type_ulist: ulist_to_html_node,
+}
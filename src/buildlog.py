@@ -0,0 +1,81 @@
+import json
+import sys
+import time
+
+
+QUIET = 0
+SUMMARY = 1
+VERBOSE = 2
+
+LEVELS = {"quiet": QUIET, "summary": SUMMARY, "verbose": VERBOSE}
+
+
+class BuildLog():
+    def __init__(self, level=SUMMARY, stream=None):
+        self.level = level
+        self.stream = stream
+        self.reset()
+
+    def reset(self):
+        self.counters = {}
+        self.errors = []
+        self.warnings = []
+        self.changed_files = []
+        self.removed_files = []
+        self.started = time.perf_counter()
+
+    def _write(self, message):
+        stream = self.stream or sys.stdout
+        stream.write(message + "\n")
+
+    def count(self, name, n=1, message=None):
+        self.counters[name] = self.counters.get(name, 0) + n
+        if message is not None and self.level >= VERBOSE:
+            self._write(message)
+
+    def changed(self, path):
+        self.changed_files.append(path)
+
+    def removed(self, path):
+        self.removed_files.append(path)
+
+    def info(self, message):
+        if self.level >= SUMMARY:
+            self._write(message)
+
+    def warning(self, message):
+        self.warnings.append(message)
+        if self.level >= SUMMARY:
+            self._write(message)
+
+    def error(self, message):
+        self.errors.append(message)
+        self._write(message)
+
+    def summary(self, action="Build"):
+        elapsed = time.perf_counter() - self.started
+        parts = [f"{value} {name.replace('_', ' ')}"
+                 for name, value in sorted(self.counters.items()) if value]
+        if self.changed_files or self.removed_files:
+            parts.append(f"{len(self.changed_files)} output(s) changed")
+        if self.warnings:
+            parts.append(f"{len(self.warnings)} warning(s)")
+        if self.errors:
+            parts.append(f"{len(self.errors)} error(s)")
+        return f"{action} finished in {elapsed:.2f} s: {', '.join(parts) or 'nothing to do'}"
+
+    def report(self):
+        return {
+            "duration_seconds": time.perf_counter() - self.started,
+            "counters": dict(self.counters),
+            "errors": list(self.errors),
+            "warnings": list(self.warnings),
+            "changed_files": list(self.changed_files),
+            "removed_files": list(self.removed_files),
+        }
+
+    def write_report(self, path, **extra):
+        data = self.report()
+        data.update(extra)
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import zlib
+
+import block
+import escaping
+import fragments
+import htmlnode
+import inline
+import LeafNode
+import links
+import parentnode
+import textnode
+
+
+PARSER_MODULES = (block, escaping, fragments, inline, textnode, htmlnode, LeafNode, parentnode,
+                  links, sys.modules[__name__])
+
+_parser_version = None
+
+
+def parser_version():
+    global _parser_version
+    if _parser_version is None:
+        digest = hashlib.sha256(sys.version.encode())
+        for module in PARSER_MODULES:
+            with open(module.__file__, 'rb') as f:
+                digest.update(f.read())
+        _parser_version = digest.hexdigest()[:16]
+    return _parser_version
+
+
+class RenderCache():
+    def __init__(self, directory):
+        self.root = directory
+        self.directory = os.path.join(directory, parser_version())
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, source_hash):
+        return os.path.join(self.directory, source_hash[:2], source_hash + ".z")
+
+    def get(self, source_hash):
+        try:
+            with open(self._path(source_hash), 'rb') as f:
+                data = zlib.decompress(f.read()).decode()
+            header, _, html = data.partition("\n")
+            title, links, images = json.loads(header)
+        except (OSError, zlib.error, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return title, html, links, images
+
+    def put(self, source_hash, title, html, links=(), images=()):
+        path = self._path(source_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            header = json.dumps([title, list(links), list(images)])
+            f.write(zlib.compress(f"{header}\n{html}".encode(), 1))
+        os.replace(tmp_path, path)
+
+    def prune(self, keep=None):
+        if not os.path.isdir(self.root):
+            return
+        for entry in os.listdir(self.root):
+            path = os.path.join(self.root, entry)
+            if path != self.directory and os.path.isdir(path):
+                shutil.rmtree(path)
+        if keep is None or not os.path.isdir(self.directory):
+            return
+        keep = {source_hash + ".z" for source_hash in keep}
+        for entry in os.scandir(self.directory):
+            if not entry.is_dir():
+                continue
+            for name in os.listdir(entry.path):
+                if name not in keep:
+                    os.remove(os.path.join(entry.path, name))
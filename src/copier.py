@@ -0,0 +1,85 @@
+import os
+import shutil
+
+from manifest import hash_file, remove_output
+from plan import COMPARE_MODES, LINK_MODES
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+FICLONE = 0x40049409
+
+
+def _reflink(src, dst):
+    if fcntl is None:
+        raise OSError("reflink is not supported on this platform")
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    shutil.copystat(src, dst)
+
+
+def place_file(src, dst, link="copy"):
+    if link not in LINK_MODES:
+        raise ValueError(f"Invalid link mode: {link}")
+    if os.path.lexists(dst):
+        os.remove(dst)
+    if link == "hardlink":
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    elif link == "reflink":
+        try:
+            _reflink(src, dst)
+            return
+        except OSError:
+            if os.path.exists(dst):
+                os.remove(dst)
+    shutil.copy2(src, dst)
+
+
+def _unchanged(src_stat, entry, previous, dst, compare):
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        return False
+    if dst_stat.st_size != src_stat.st_size:
+        return False
+    if compare == "hash":
+        return previous is not None and previous.get("hash") == entry["hash"]
+    return dst_stat.st_mtime_ns == src_stat.st_mtime_ns
+
+
+def sync_files(files, dst, previous=None, compare="mtime", link="copy"):
+    if compare not in COMPARE_MODES:
+        raise ValueError(f"Invalid compare mode: {compare}")
+    previous = previous or {}
+    entries = {}
+    copied = []
+
+    for s, d, st in files:
+        old = previous.get(s)
+        entry = {"size": st.st_size, "mtime": st.st_mtime_ns, "output": d}
+        if compare == "hash":
+            if (old is not None and old.get("size") == st.st_size
+                    and old.get("mtime") == st.st_mtime_ns and "hash" in old):
+                entry["hash"] = old["hash"]
+            else:
+                entry["hash"] = hash_file(s)
+        entries[s] = entry
+        if not _unchanged(st, entry, old, d, compare):
+            place_file(s, d, link)
+            copied.append((s, d))
+
+    removed = []
+    for s, old in previous.items():
+        if s not in entries:
+            remove_output(old["output"], dst)
+            removed.append(old["output"])
+
+    return entries, copied, removed
+
@@ -0,0 +1,20 @@
+class Markup(str):
+    __slots__ = ()
+
+
+def escape_text(text):
+    if "&" not in text and "<" not in text and ">" not in text:
+        return text
+    if type(text) is Markup:
+        return text
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def escape_attr(value):
+    if ("&" not in value and "<" not in value and ">" not in value
+            and '"' not in value):
+        return value
+    if type(value) is Markup:
+        return value
+    return (value.replace("&", "&amp;").replace("<", "&lt;")
+            .replace(">", "&gt;").replace('"', "&quot;"))
@@ -0,0 +1,62 @@
+from collections import OrderedDict
+
+
+DEFAULT_SIZE = 0
+
+
+class FragmentCache():
+    def __init__(self, maxsize=DEFAULT_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.seen = set()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text):
+        html = self.entries.get(text)
+        if html is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(text)
+        self.hits += 1
+        return html
+
+    def admit(self, text):
+        if text in self.seen:
+            self.seen.discard(text)
+            return True
+        if len(self.seen) >= self.maxsize:
+            self.seen.clear()
+        self.seen.add(text)
+        return False
+
+    def put(self, text, html):
+        if self.maxsize <= 0:
+            return
+        self.entries[text] = html
+        self.entries.move_to_end(text)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def resize(self, maxsize):
+        self.maxsize = maxsize
+        while len(self.entries) > max(maxsize, 0):
+            self.entries.popitem(last=False)
+        self.seen.clear()
+
+    def clear(self):
+        self.entries.clear()
+        self.seen.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return self.hits, self.misses
+
+
+inline_cache = FragmentCache()
+
+
+def configure(maxsize):
+    if maxsize != inline_cache.maxsize:
+        inline_cache.resize(maxsize)
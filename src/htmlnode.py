@@ -1,5 +1,13 @@
 
+from escaping import escape_attr
+
+
+EMPTY_CHILDREN = ()
+
+
 class HTMLNode():
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.value = value
         self.tag = tag
@@ -9,13 +17,17 @@ class HTMLNode():
     def to_html(self):
         raise NotImplementedError("to_html method not implemented")
 
+    def emit_html(self, write):
+        write(self.to_html())
+
+    def write_html(self, fp):
+        self.emit_html(fp.write)
+
     def props_to_html(self):
         if self.props is None:
             return ""
-        props_html = ""
-        for prop in self.props:
-            props_html += f' {prop}="{self.props[prop]}"'
-        return props_html
+        return "".join(
+            f' {prop}="{escape_attr(value)}"' for prop, value in self.props.items())
 
     def __eq__(self, other):
         return (
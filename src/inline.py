@@ -2,13 +2,70 @@ from textnode import TextType, TextNode
 import re
 
 
+INLINE_SPECIAL = re.compile(r"[*`\[]")
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
+
 def text_to_textnodes(text):
-    nodes = [TextNode(text, TextType.TEXT)]
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
+    match = INLINE_SPECIAL.search(text)
+    if match is None:
+        return [TextNode(text, TextType.TEXT)] if text else []
+    return scan_inline(text, match)
+
+
+def scan_inline(text, match=None):
+    nodes = []
+    text_start = 0
+    pos = 0
+    while True:
+        if match is None:
+            match = INLINE_SPECIAL.search(text, pos)
+            if match is None:
+                break
+        i = match.start()
+        match = None
+        char = text[i]
+        node = None
+
+        if char == "[":
+            if i > 0 and text[i - 1] == "!":
+                found = IMAGE_PATTERN.match(text, i - 1)
+                text_type = TextType.IMAGE
+            else:
+                found = LINK_PATTERN.match(text, i)
+                text_type = TextType.LINK
+            if found is None:
+                pos = i + 1
+                continue
+            i = found.start()
+            node = TextNode(found.group(1), text_type, found.group(2))
+            next_pos = found.end()
+        else:
+            delimiter = "**" if text.startswith("**", i) else char
+            content_start = i + len(delimiter)
+            end = text.find(delimiter, content_start)
+            if end == -1:
+                raise ValueError("Invalid markdown, formatted section not closed")
+            content = text[content_start:end]
+            if delimiter == "**":
+                text_type = TextType.BOLD
+            elif delimiter == "*":
+                text_type = TextType.ITALIC
+            else:
+                text_type = TextType.CODE
+            if content != "":
+                node = TextNode(content, text_type)
+            next_pos = end + len(delimiter)
+
+        if i > text_start:
+            nodes.append(TextNode(text[text_start:i], TextType.TEXT))
+        if node is not None:
+            nodes.append(node)
+        text_start = pos = next_pos
+
+    if text_start < len(text):
+        nodes.append(TextNode(text[text_start:], TextType.TEXT))
     return nodes
 
 
@@ -88,12 +145,8 @@ def split_nodes_link(old_nodes):
 
 
 def extract_markdown_images(text):
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return IMAGE_PATTERN.findall(text)
 
 
 def extract_markdown_links(text):
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return LINK_PATTERN.findall(text)
@@ -0,0 +1,62 @@
+import os
+import posixpath
+from urllib.parse import unquote, urlsplit
+
+
+INDEX_NAME = "index.html"
+TEXT_TAGS = frozenset((None, "b", "i", "code", "pre"))
+
+
+def _collect(children, links, images):
+    for child in children:
+        tag = child.tag
+        if tag in TEXT_TAGS:
+            continue
+        if tag == "a":
+            links[child.props["href"]] = None
+        elif tag == "img":
+            images[child.props["src"]] = None
+        elif child.children:
+            _collect(child.children, links, images)
+
+
+def page_references(node):
+    links = {}
+    images = {}
+    _collect(node.children, links, images)
+    return list(links), list(images)
+
+
+def resolve(url, page_output, dest_dir):
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc or not parts.path:
+        return []
+    path = unquote(parts.path)
+    if not path.startswith("/"):
+        page_url = "/" + os.path.relpath(page_output, dest_dir).replace(os.sep, "/")
+        path = posixpath.join(posixpath.dirname(page_url), path)
+    target = os.path.join(dest_dir, posixpath.normpath(path).lstrip("/"))
+    target = os.path.normpath(target)
+    if path.endswith("/"):
+        return [os.path.join(target, INDEX_NAME)]
+    if not posixpath.splitext(path)[1]:
+        return [os.path.join(target, INDEX_NAME), target + ".html"]
+    return [target]
+
+
+def check_references(pages, paths, static, dest_dir):
+    static_outputs = {os.path.normpath(entry["output"]) for entry in static.values()}
+    broken = []
+    for source, entry in pages.items():
+        output = entry["output"]
+        for url in entry.get("links", ()):
+            targets = resolve(url, output, dest_dir)
+            if targets and not any(paths.source_for(target) is not None
+                                   or target in static_outputs
+                                   for target in targets):
+                broken.append((source, "link", url))
+        for url in entry.get("images", ()):
+            targets = resolve(url, output, dest_dir)
+            if targets and not any(target in static_outputs for target in targets):
+                broken.append((source, "image", url))
+    return broken
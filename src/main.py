@@ -1,105 +1,599 @@
+import hashlib
+import io
 import os
-import shutil
+import sys
+import time
+from functools import partial
 from block import markdown_to_html_node
+from buildlog import LEVELS, QUIET, SUMMARY, VERBOSE, BuildLog
+from fragments import DEFAULT_SIZE, configure, inline_cache
+from manifest import BuildManifest, hash_file, is_fresh, remove_output
+from paths import PathMap
+from plan import COMPARE_MODES, LINK_MODES, scan_pages, scan_site, scan_static
+from profiling import NULL_PROFILER, Profiler
+from template import Template
+from writer import write_if_changed
+
+
+MANIFEST_PATH = '.build_cache/manifest.json'
+RENDER_CACHE_PATH = '.build_cache/render'
+CACHE_COUNTERS = ("inline_cache_hits", "inline_cache_misses",
+                  "render_cache_hits", "render_cache_misses")
 
 
 def extract_title(markdown):
-    for line in markdown.splitlines():
+    lines = markdown.splitlines() if isinstance(markdown, str) else markdown
+    for line in lines:
         if line.startswith('# '):
             return line[2:].strip()
     raise ValueError("Title must have h1 tag")
 
 
-def recursive_copy(src, dst):
-    if os.path.exists(dst):
-        shutil.rmtree(dst)
-    os.makedirs(dst)
-    log = []
-
-    def copy_contents(src_dir, dst_dir):
-        for item in os.listdir(src_dir):
-            s = os.path.join(src_dir, item)
-            d = os.path.join(dst_dir, item)
-
-            if os.path.isdir(s):
-                os.makedirs(d, exist_ok=True)
-                log.append(f"Directory created: {d}")
-                copy_contents(s, d)
-            else:
-                shutil.copy2(s, d)
-                log.append(f"File copied: {s} to {d}")
-
-    copy_contents(src, dst)
-    for entry in log:
-        print(entry)
-
-
-def generate_page(from_path, template_path, dest_path):
-    print(f"Generating page from {from_path} to {
-          dest_path} using {template_path}")
-
-    with open(from_path) as rfp:
-        fp = rfp.read()
-
-    with open(template_path) as rtp:
-        tp = rtp.read()
-
-    html_node = markdown_to_html_node(fp)
-    content = html_node.to_html()
-    title = extract_title(fp)
-
-    new_content = tp.replace("{{ Title }}", title).replace(
-        "{{ Content }}", content)
-
-    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-
-    with open(dest_path, 'w') as file:
-        file.write(new_content)
+def recursive_copy(src, dst, manifest=None, compare="mtime", link="copy",
+                   profiler=None, log=None, plan=None):
+    from copier import sync_files
+
+    log = log or BuildLog(QUIET)
+    stage = (profiler or NULL_PROFILER).stage
+    if plan is None:
+        with stage("scan"):
+            plan = scan_static(src, dst)
+    previous = None
+    if manifest is None:
+        if os.path.exists(dst):
+            import shutil
+            shutil.rmtree(dst)
+    else:
+        previous = manifest.static
+    with stage("copy"):
+        created = plan.make_directories()
+        entries, copied, removed = sync_files(
+            plan.files, dst, previous, compare, link)
+    if manifest is not None:
+        manifest.static = entries
+
+    if log.level >= VERBOSE:
+        for d in created:
+            log.count("directories_created", message=f"Directory created: {d}")
+        for s, d in copied:
+            log.count("files_copied", message=f"File copied: {s} to {d}")
+        for d in removed:
+            log.count("files_removed", message=f"File removed: {d}")
+    else:
+        log.count("directories_created", len(created))
+        log.count("files_copied", len(copied))
+        log.count("files_removed", len(removed))
+    for _, d in copied:
+        log.changed(d)
+    for d in removed:
+        log.removed(d)
+
+
+def read_source(from_path, profiler=NULL_PROFILER):
+    with profiler.stage("read"):
+        with open(from_path, 'rb') as rfp:
+            data = rfp.read()
+    with profiler.stage("hash"):
+        return data, hashlib.sha256(data).hexdigest()
+
+
+def render_source(from_path, cache=None, profiler=NULL_PROFILER):
+    data, source_hash = read_source(from_path, profiler)
+    return render_data(data, cache, profiler, source_hash)
+
+
+def render_data(data, cache=None, profiler=NULL_PROFILER, source_hash=None):
+    from links import page_references
+
+    if cache is not None:
+        with profiler.stage("cache"):
+            if source_hash is None:
+                source_hash = hashlib.sha256(data).hexdigest()
+            cached = cache.get(source_hash)
+        if cached is not None:
+            return cached
+
+    markdown = io.TextIOWrapper(io.BytesIO(data)).read()
+    with profiler.stage("parse"):
+        html_node = markdown_to_html_node(markdown)
+        title = extract_title(markdown)
+    with profiler.stage("to_html"):
+        content = html_node.to_html()
+    links, images = page_references(html_node)
+
+    if cache is not None:
+        with profiler.stage("cache"):
+            cache.put(source_hash, title, content, links, images)
+    return title, content, links, images
+
+
+def render_many(documents, template=None):
+    for markdown in documents:
+        if not isinstance(markdown, str):
+            markdown = "".join(markdown)
+        content = markdown_to_html_node(markdown).to_html()
+        if template is None:
+            yield content
+        else:
+            yield template.render(Title=extract_title(markdown), Content=content)
+
+
+def generate_page(from_path, template_path, dest_path, template=None,
+                  cache=None, profiler=None):
+    if template is None:
+        template = Template.from_file(template_path)
+    profiler = profiler or NULL_PROFILER
+    data, source_hash = read_source(from_path, profiler)
+    return _render_page(from_path, data, source_hash, dest_path, template,
+                        cache, profiler)[0]
+
+
+def _render_page(from_path, data, source_hash, dest_path, template, cache,
+                 profiler):
+    start = time.perf_counter()
+    title, content, links, images = render_data(data, cache, profiler,
+                                                source_hash)
+    with profiler.stage("template"):
+        new_content = template.render(Title=title, Content=content)
+    with profiler.stage("write"):
+        changed = write_if_changed(dest_path, new_content)
+    profiler.add_page(from_path, time.perf_counter() - start)
+    return changed, (source_hash, links, images)
+
+
+def _cache_stats(cache):
+    hits, misses = inline_cache.stats()
+    if cache is None:
+        return hits, misses, 0, 0
+    return hits, misses, cache.hits, cache.misses
+
+
+def _cache_stats_since(cache, before):
+    return tuple(now - then for now, then in zip(_cache_stats(cache), before))
+
+
+def _render_job(template, cache, profile, inline_cache_size, job):
+    from_path, dest_path, entry = job
+    configure(inline_cache_size)
+    before = _cache_stats(cache)
+    profiler = Profiler() if profile else None
+    try:
+        data, source_hash = read_source(from_path, profiler or NULL_PROFILER)
+        if is_fresh(entry, source_hash, dest_path):
+            return None, None, profiler, _cache_stats_since(cache, before), None
+        changed, page = _render_page(from_path, data, source_hash, dest_path,
+                                     template, cache, profiler or NULL_PROFILER)
+    except Exception as e:
+        return (f"{type(e).__name__}: {e}", False, profiler,
+                _cache_stats_since(cache, before), None)
+    return None, changed, profiler, _cache_stats_since(cache, before), page
+
+
+def _render_pipelined(pages, template, cache, profiler, io_threads):
+    from pipeline import run_pipeline
+
+    profiler = profiler or NULL_PROFILER
+
+    def read(i):
+        from_path, dest_path, entry = pages[i]
+        data, source_hash = read_source(from_path, profiler)
+        if is_fresh(entry, source_hash, dest_path):
+            return None
+        return data, source_hash
+
+    def render(i, source):
+        if source is None:
+            return None
+        start = time.perf_counter()
+        data, source_hash = source
+        title, content, links, images = render_data(data, cache, profiler,
+                                                    source_hash)
+        rendered[i] = (source_hash, links, images)
+        with profiler.stage("template"):
+            new_content = template.render(Title=title, Content=content)
+        profiler.add_page(pages[i][0], time.perf_counter() - start)
+        return new_content
+
+    def write(i, new_content):
+        if new_content is None:
+            return
+        with profiler.stage("write"):
+            if write_if_changed(pages[i][1], new_content):
+                changed.add(i)
+
+    changed = set()
+    rendered = {}
+    errors = run_pipeline(range(len(pages)), read, render, write,
+                          readers=io_threads, depth=io_threads * 4)
+    return [(errors.get(i), i in changed if i in rendered else None, None,
+             (0, 0, 0, 0), rendered.get(i)) for i in range(len(pages))]
+
+
+def render_pages(pages, template_path, jobs=1, cache=None, profiler=None,
+                 log=None, io_threads=0):
+    log = log or BuildLog(QUIET)
+    template = Template.from_file(template_path)
+    render_job = partial(_render_job, template, cache, profiler is not None,
+                         inline_cache.maxsize)
+    if io_threads > 0 and jobs <= 1:
+        before = _cache_stats(cache)
+        results = _render_pipelined(pages, template, cache, profiler,
+                                    io_threads)
+        for name, n in zip(CACHE_COUNTERS, _cache_stats_since(cache, before)):
+            log.count(name, n)
+    elif jobs <= 1 or len(pages) <= 1:
+        results = list(map(render_job, pages))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, len(pages) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(render_job, pages, chunksize=chunksize))
+
+    errors = {}
+    rendered = {}
+    for (from_path, dest_path, _), result in zip(pages, results):
+        error, changed, job_profiler, cache_stats, page = result
+        if job_profiler is not None:
+            profiler.merge(job_profiler)
+        for name, n in zip(CACHE_COUNTERS, cache_stats):
+            log.count(name, n)
+        if error is not None:
+            errors[from_path] = error
+            log.error(f"Error generating {from_path}: {error}")
+            continue
+        if changed is None:
+            log.count("pages_skipped")
+            continue
+        rendered[from_path] = page
+        log.count("pages_generated", message=(
+            f"Generating page from {from_path} to {dest_path} "
+            f"using {template_path}"))
+        if changed:
+            log.changed(dest_path)
+        else:
+            log.count("pages_unchanged")
+    return errors, rendered
+
+
+def page_entry(digest, output, links, images):
+    return {"hash": digest, "output": output, "links": links, "images": images}
+
+
+def check_links(manifest, paths, dest_dir_path, log, reported=()):
+    from links import check_references
+
+    broken = check_references(manifest.pages, paths, manifest.static,
+                              dest_dir_path)
+    for source, kind, url in broken:
+        if (source, kind, url) not in reported:
+            log.warning(f"Broken {kind} in {source}: {url}")
+    return broken
+
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path,
+                             manifest=None, jobs=1, cache=None, profiler=None,
+                             log=None, io_threads=0, plan=None, paths=None):
+    log = log or BuildLog(QUIET)
+    stage = (profiler or NULL_PROFILER).stage
+    rebuild_all = True
+    if manifest is not None:
+        template_hash = hash_file(template_path)
+        rebuild_all = manifest.template != template_hash
+
+    if plan is None:
+        with stage("scan"):
+            plan = scan_pages(dir_path_content, dest_dir_path, paths=paths)
+    pages = plan.pages
+
+    work = []
+    for source, dest_path in pages:
+        entry = None
+        if manifest is not None and not rebuild_all:
+            entry = manifest.pages.get(source)
+        work.append((source, dest_path, entry))
+
+    if work:
+        plan.make_directories()
+    errors, rendered = render_pages(work, template_path, jobs, cache,
+                                    profiler, log, io_threads)
+
+    if manifest is not None:
+        manifest.template = template_hash
+        seen = set()
+        for source, dest_path in pages:
+            seen.add(source)
+            if source in errors:
+                manifest.pages.pop(source, None)
+                continue
+            page = rendered.get(source)
+            if page is None:
+                continue
+            entry = manifest.pages.get(source)
+            if entry is not None and entry["output"] != dest_path:
+                remove_output(entry["output"], dest_dir_path)
+                log.removed(entry["output"])
+            manifest.pages[source] = page_entry(page[0], dest_path, *page[1:])
+        for source in list(manifest.pages):
+            if source not in seen:
+                plan.paths.discard(source)
+                dest_path = manifest.pages.pop(source)["output"]
+                remove_output(dest_path, dest_dir_path)
+                log.count("pages_removed", message=f"Page removed: {dest_path}")
+                log.removed(dest_path)
+        with stage("links"):
+            check_links(manifest, plan.paths, dest_dir_path, log)
+
+    if errors:
+        raise ValueError(f"{len(errors)} page(s) failed to generate")
 
     return None
 
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path):
-
-    for item in os.listdir(dir_path_content):
-
-        item_path = os.path.join(dir_path_content, item)
-
-        if os.path.isfile(item_path) and item_path.endswith(".md"):
-
-            with open(item_path) as item_p:
-                md_file = item_p.read()
-
-            title = extract_title(md_file)
-            html_n = markdown_to_html_node(md_file)
-            content = html_n.to_html()
-
-            with open(template_path) as item_t:
-                t_path = item_t.read()
-
-            rel_path = os.path.relpath(item_path, dir_path_content)
-            dest_path = os.path.join(dest_dir_path, rel_path)
-            dest_path = dest_path.replace('.md', '.html')
-            new_html = t_path.replace("{{ Title }}", title).replace(
-                "{{ Content }}", content)
-
-            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-
-            with open(dest_path, 'w') as dest_file:
-                dest_file.write(new_html)
-
-        elif os.path.isdir(item_path):
-            new_dest_dir = os.path.join(dest_dir_path, item)
-            os.makedirs(new_dest_dir, exist_ok=True)
-            generate_pages_recursive(item_path, template_path, new_dest_dir)
-
-    return None
-
-
-def main():
-    recursive_copy('static', 'public')
-    generate_pages_recursive(
-        'content/', 'template.html', 'public/')
-
-
-main()
+def watch_site(dir_path_content, static_path, template_path, dest_dir_path,
+               manifest, cache=None, port=8888, log=None, paths=None,
+               compare="mtime", link="copy"):
+    from watch import Watcher, serve
+
+    log = log or BuildLog(SUMMARY)
+    if paths is None:
+        paths = PathMap(dir_path_content, dest_dir_path)
+    server = serve(dest_dir_path, port)
+    log.info(f"Serving {dest_dir_path} on http://localhost:{server.server_port}/")
+    static_prefix = os.path.join(static_path, "")
+    template = Template.from_file(template_path)
+    watcher = Watcher([dir_path_content, static_path, template_path])
+    reported = set(check_links(manifest, paths, dest_dir_path, BuildLog(QUIET)))
+
+    def on_change(changed, removed):
+        nonlocal template, reported
+        log.reset()
+        start = time.perf_counter()
+        pages = [p for p in changed if p.endswith(".md")
+                 and not p.startswith(static_prefix)]
+        try:
+            if any(p.startswith(static_prefix) for p in changed + removed):
+                recursive_copy(static_path, dest_dir_path, manifest, compare,
+                               link, log=log)
+            if template_path in changed:
+                template = Template.from_file(template_path)
+                generate_pages_recursive(
+                    dir_path_content, template_path, dest_dir_path,
+                    manifest, cache=cache, log=log, paths=paths)
+                pages = []
+            for source in pages:
+                try:
+                    dest_path = paths.add(source)
+                    data, source_hash = read_source(source)
+                    title, content, links, images = render_data(
+                        data, cache, source_hash=source_hash)
+                    if write_if_changed(dest_path, template.render(
+                            Title=title, Content=content)):
+                        log.changed(dest_path)
+                except (OSError, ValueError) as e:
+                    manifest.pages.pop(source, None)
+                    log.error(f"Error generating {source}: {e}")
+                    continue
+                manifest.pages[source] = page_entry(
+                    source_hash, dest_path, links, images)
+                log.count("pages_generated", message=(
+                    f"Generating page from {source} to {dest_path} "
+                    f"using {template_path}"))
+            for source in removed:
+                paths.discard(source)
+                if source in manifest.pages:
+                    dest_path = manifest.pages.pop(source)["output"]
+                    remove_output(dest_path, dest_dir_path)
+                    log.count("pages_removed", message=f"Page removed: {dest_path}")
+            link_log = log if template_path not in changed else BuildLog(QUIET)
+            reported = set(check_links(manifest, paths, dest_dir_path,
+                                       link_log, reported))
+        except (OSError, ValueError) as e:
+            log.error(f"Error: {e}")
+        manifest.save()
+        elapsed = (time.perf_counter() - start) * 1000
+        log.info(f"Rebuilt in {elapsed:.1f} ms")
+
+    try:
+        watcher.run(on_change)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+def build_site(args):
+    log = BuildLog(LEVELS[args.log_level])
+    jobs = args.jobs or os.cpu_count() or 1
+    configure(args.inline_cache_size)
+
+    paths = PathMap('content/', 'public/', args.pretty_urls)
+    if args.dry_run:
+        plan = scan_site('content/', 'static', 'public/', paths)
+        for line in plan.describe():
+            print(line)
+        log.info(f"{len(plan.files)} file(s) to copy, "
+                 f"{len(plan.pages)} page(s) to render")
+        return 0
+
+    cache = None
+    if not args.no_cache:
+        from cache import RenderCache
+        cache = RenderCache(RENDER_CACHE_PATH)
+
+    profiler = Profiler() if args.profile or args.profile_output else None
+    stats = None
+    if args.profile_output:
+        import cProfile
+        stats = cProfile.Profile()
+        stats.enable()
+
+    manifest = BuildManifest(MANIFEST_PATH)
+    try:
+        with (profiler or NULL_PROFILER).stage("scan"):
+            plan = scan_site('content/', 'static', 'public/', paths)
+        recursive_copy('static', 'public', manifest, args.compare, args.link,
+                       profiler, log, plan)
+        generate_pages_recursive(
+            'content/', 'template.html', 'public/', manifest, jobs, cache,
+            profiler, log, args.io_threads, plan, paths)
+    except ValueError as e:
+        if not log.errors:
+            log.error(f"Error: {e}")
+    finally:
+        manifest.save()
+        if cache is not None:
+            cache.prune(entry["hash"] for entry in manifest.pages.values())
+        if stats is not None:
+            stats.disable()
+            stats.dump_stats(args.profile_output)
+        if profiler is not None:
+            print(profiler.report(args.profile_top))
+        log.info(log.summary())
+        if args.report:
+            log.write_report(args.report)
+
+    if args.watch:
+        watch_site('content/', 'static', 'template.html', 'public/',
+                   manifest, cache, args.port, log, paths, args.compare,
+                   args.link)
+        return 0
+    return 1 if log.errors else 0
+
+
+def render_one(args):
+    template = Template.from_file(args.template)
+    if args.output:
+        generate_page(args.source, args.template, args.output, template)
+        return 0
+    with open(args.source) as rfp:
+        markdown = rfp.read()
+    content = markdown_to_html_node(markdown)
+    title = extract_title(markdown)
+    template.write(sys.stdout, Title=title, Content=content)
+    return 0
+
+
+def check_site(args):
+    from links import check_references, page_references
+
+    log = BuildLog(LEVELS[args.log_level])
+    paths = PathMap('content/', 'public/', args.pretty_urls)
+    plan = scan_site('content/', 'static', 'public/', paths)
+    pages = {}
+    for source, dest_path in plan.pages:
+        with open(source) as rfp:
+            markdown = rfp.read()
+        links = images = ()
+        try:
+            links, images = page_references(markdown_to_html_node(markdown))
+            extract_title(markdown)
+        except ValueError as e:
+            log.error(f"Error in {source}: {e}")
+        pages[source] = {"output": dest_path, "links": links, "images": images}
+    static = {src: {"output": dst} for src, dst, _ in plan.files}
+    for source, kind, url in check_references(pages, paths, static, 'public/'):
+        log.warning(f"Broken {kind} in {source}: {url}")
+    log.count("pages_checked", len(pages))
+    log.info(log.summary("Check"))
+    return 1 if log.errors or log.warnings else 0
+
+
+COMMANDS = {"build": build_site, "render-one": render_one, "check": check_site}
+
+
+def add_log_options(parser):
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument(
+        "-q", "--quiet", dest="log_level", action="store_const",
+        const="quiet", default="summary", help="only print errors")
+    verbosity.add_argument(
+        "-v", "--verbose", dest="log_level", action="store_const",
+        const="verbose", help="print every page generated and file copied")
+
+
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the static site")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    build = commands.add_parser(
+        "build", help="copy static/ and render content/ into public/ (default)")
+    build.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="render pages in N worker processes (0 = one per CPU)")
+    build.add_argument(
+        "--compare", choices=COMPARE_MODES, default="mtime",
+        help="how to detect changed static files")
+    build.add_argument(
+        "--link", choices=LINK_MODES, default="copy",
+        help="copy static files, or hardlink/reflink them when possible")
+    build.add_argument(
+        "--io-threads", type=int, default=0, metavar="N",
+        help="when rendering in one process, prefetch sources and write "
+             "outputs on N background threads")
+    build.add_argument(
+        "--no-cache", action="store_true",
+        help="parse every page instead of reusing cached render output")
+    build.add_argument(
+        "--inline-cache-size", type=int, default=DEFAULT_SIZE, metavar="N",
+        help="keep the rendered HTML of up to N repeated inline fragments "
+             "per process (0 disables)")
+    build.add_argument(
+        "--pretty-urls", action="store_true",
+        help="write content/page.md to public/page/index.html")
+    build.add_argument(
+        "-n", "--dry-run", action="store_true",
+        help="print the build plan without copying or rendering anything")
+    build.add_argument(
+        "--watch", action="store_true",
+        help="after building, serve public/ and rebuild files as they change")
+    build.add_argument(
+        "--port", type=int, default=8888,
+        help="port to serve public/ on in watch mode")
+    build.add_argument(
+        "--profile", action="store_true",
+        help="time each build stage and print a summary")
+    build.add_argument(
+        "--profile-top", type=int, default=10, metavar="N",
+        help="number of slowest pages to list with --profile")
+    build.add_argument(
+        "--profile-output", metavar="FILE",
+        help="also dump cProfile stats of the main process to FILE")
+    add_log_options(build)
+    build.add_argument(
+        "--report", metavar="FILE",
+        help="write a JSON build report with counters and errors to FILE")
+
+    render = commands.add_parser(
+        "render-one", help="render a single page without building the site")
+    render.add_argument("source", help="markdown file to render")
+    render.add_argument(
+        "-t", "--template", default="template.html",
+        help="template to render the page with")
+    render.add_argument(
+        "-o", "--output", metavar="FILE",
+        help="write the page to FILE instead of stdout")
+
+    check = commands.add_parser(
+        "check", help="check pages, links and images without writing anything")
+    check.add_argument(
+        "--pretty-urls", action="store_true",
+        help="resolve links as if pages were built with --pretty-urls")
+    add_log_options(check)
+
+    return parser
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv or argv[0] not in COMMANDS and argv[0] not in ("-h", "--help"):
+        argv = ["build", *argv]
+    args = build_parser().parse_args(argv)
+    return COMMANDS[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
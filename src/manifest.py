@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+
+
+MANIFEST_VERSION = 3
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest():
+    def __init__(self, path):
+        self.path = path
+        self.template = None
+        self.pages = {}
+        self.static = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != MANIFEST_VERSION:
+            return
+        self.template = data.get("template")
+        self.pages = data.get("pages", {})
+        self.static = data.get("static", {})
+
+    def save(self):
+        data = {
+            "version": MANIFEST_VERSION,
+            "template": self.template,
+            "pages": self.pages,
+            "static": self.static,
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def is_fresh(entry, digest, output):
+    if entry is None:
+        return False
+    return (
+        entry["hash"] == digest
+        and entry["output"] == output
+        and os.path.exists(output)
+    )
+
+
+def remove_output(path, root):
+    if os.path.exists(path):
+        os.remove(path)
+    directory = os.path.dirname(path)
+    root = os.path.normpath(root)
+    while directory and os.path.normpath(directory) != root:
+        try:
+            os.rmdir(directory)
+        except OSError:
+            break
+        directory = os.path.dirname(directory)
@@ -0,0 +1,50 @@
+import os
+
+
+PAGE_SUFFIX = ".md"
+OUTPUT_SUFFIX = ".html"
+INDEX_NAME = "index"
+
+
+class PathMap():
+    def __init__(self, content_dir, dest_dir, pretty=False):
+        self.content_dir = content_dir
+        self.dest_dir = dest_dir
+        self.pretty = pretty
+        self.outputs = {}
+        self.sources = {}
+
+    def output_name(self, rel_path):
+        stem, suffix = os.path.splitext(rel_path)
+        if suffix != PAGE_SUFFIX:
+            raise ValueError(f"Not a page: {rel_path}")
+        if self.pretty and os.path.basename(stem) != INDEX_NAME:
+            return os.path.join(stem, INDEX_NAME + OUTPUT_SUFFIX)
+        return stem + OUTPUT_SUFFIX
+
+    def output_for(self, source, rel_path=None):
+        output = self.outputs.get(source)
+        if output is None:
+            if rel_path is None:
+                rel_path = os.path.relpath(source, self.content_dir)
+            output = os.path.join(self.dest_dir, self.output_name(rel_path))
+        return output
+
+    def add(self, source, rel_path=None):
+        output = self.output_for(source, rel_path)
+        key = os.path.normpath(output)
+        other = self.sources.get(key)
+        if other is not None and other != source:
+            raise ValueError(f"{source} and {other} both map to {output}")
+        self.outputs[source] = output
+        self.sources[key] = source
+        return output
+
+    def discard(self, source):
+        output = self.outputs.pop(source, None)
+        if output is not None:
+            self.sources.pop(os.path.normpath(output), None)
+        return output
+
+    def source_for(self, output):
+        return self.sources.get(os.path.normpath(output))
@@ -0,0 +1,56 @@
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+_DONE = object()
+
+
+def _describe(error):
+    return f"{type(error).__name__}: {error}"
+
+
+def run_pipeline(items, read, render, write, readers=4, depth=16):
+    errors = {}
+    write_queue = queue.Queue(maxsize=depth)
+
+    def drain():
+        while True:
+            entry = write_queue.get()
+            if entry is _DONE:
+                return
+            item, result = entry
+            try:
+                write(item, result)
+            except Exception as e:
+                errors[item] = _describe(e)
+
+    writer = threading.Thread(target=drain, daemon=True)
+    writer.start()
+    try:
+        with ThreadPoolExecutor(max_workers=readers) as pool:
+            remaining = iter(items)
+            in_flight = deque()
+
+            def prefetch():
+                while len(in_flight) < depth:
+                    item = next(remaining, _DONE)
+                    if item is _DONE:
+                        return
+                    in_flight.append((item, pool.submit(read, item)))
+
+            prefetch()
+            while in_flight:
+                item, future = in_flight.popleft()
+                prefetch()
+                try:
+                    result = render(item, future.result())
+                except Exception as e:
+                    errors[item] = _describe(e)
+                    continue
+                write_queue.put((item, result))
+    finally:
+        write_queue.put(_DONE)
+        writer.join()
+    return errors
@@ -0,0 +1,95 @@
+import os
+
+from paths import PAGE_SUFFIX, PathMap
+
+
+COMPARE_MODES = ("mtime", "hash")
+LINK_MODES = ("copy", "hardlink", "reflink")
+
+
+class BuildPlan():
+    def __init__(self):
+        self.directories = []
+        self.pages = []
+        self.files = []
+        self.paths = None
+        self._known = set()
+        self._made = 0
+
+    def add_directory(self, path):
+        path = os.path.normpath(path)
+        if path not in self._known:
+            self._known.add(path)
+            self.directories.append(path)
+
+    def make_directories(self):
+        created = []
+        for path in self.directories[self._made:]:
+            try:
+                os.mkdir(path)
+            except FileExistsError:
+                continue
+            except FileNotFoundError:
+                os.makedirs(path)
+            created.append(path)
+        self._made = len(self.directories)
+        return created
+
+    def describe(self):
+        lines = [f"mkdir  {path}" for path in self.directories
+                 if not os.path.isdir(path)]
+        lines.extend(f"copy   {src} -> {dst}" for src, dst, _ in self.files)
+        lines.extend(f"render {src} -> {dst}" for src, dst in self.pages)
+        return lines
+
+
+def _scan(src):
+    stack = [(src, "")]
+    while stack:
+        src_dir, rel_dir = stack.pop()
+        files = []
+        subdirectories = []
+        with os.scandir(src_dir) as it:
+            for entry in sorted(it, key=lambda entry: entry.name):
+                if entry.is_dir():
+                    subdirectories.append(
+                        (entry.path, os.path.join(rel_dir, entry.name)))
+                elif entry.is_file():
+                    files.append(entry)
+        stack.extend(reversed(subdirectories))
+        yield rel_dir, files
+
+
+def scan_pages(dir_path_content, dest_dir_path, plan=None, paths=None):
+    if plan is None:
+        plan = BuildPlan()
+    if paths is None:
+        paths = PathMap(dir_path_content, dest_dir_path)
+    plan.paths = paths
+    for rel_dir, files in _scan(dir_path_content):
+        for entry in files:
+            if not entry.name.endswith(PAGE_SUFFIX):
+                continue
+            dest_path = paths.add(entry.path, os.path.join(rel_dir, entry.name))
+            plan.add_directory(os.path.dirname(dest_path))
+            plan.pages.append((entry.path, dest_path))
+    return plan
+
+
+def scan_static(src, dst, plan=None):
+    if plan is None:
+        plan = BuildPlan()
+    for rel_dir, files in _scan(src):
+        dst_dir = os.path.join(dst, rel_dir)
+        plan.add_directory(dst_dir)
+        for entry in files:
+            plan.files.append(
+                (entry.path, os.path.join(dst_dir, entry.name), entry.stat()))
+    return plan
+
+
+def scan_site(dir_path_content, static_path, dest_dir_path, paths=None):
+    plan = BuildPlan()
+    scan_static(static_path, dest_dir_path, plan)
+    scan_pages(dir_path_content, dest_dir_path, plan, paths)
+    return plan
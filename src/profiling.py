@@ -0,0 +1,85 @@
+import math
+import time
+from contextlib import contextmanager, nullcontext
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Profiler():
+    def __init__(self):
+        self.samples = {}
+        self.pages = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        self.samples.setdefault(name, []).append(seconds)
+
+    def add_page(self, page, seconds):
+        self.pages[page] = seconds
+
+    def merge(self, other):
+        for name, values in other.samples.items():
+            self.samples.setdefault(name, []).extend(values)
+        self.pages.update(other.pages)
+
+    def summary(self):
+        rows = []
+        for name, values in self.samples.items():
+            values = sorted(values)
+            rows.append({
+                "stage": name,
+                "count": len(values),
+                "total": sum(values),
+                "p50": percentile(values, 0.50),
+                "p95": percentile(values, 0.95),
+                "max": values[-1],
+            })
+        return rows
+
+    def slowest_pages(self, n=10):
+        return sorted(self.pages.items(), key=lambda item: item[1], reverse=True)[:n]
+
+    def report(self, top=10):
+        lines = [f"{'stage':<10} {'count':>7} {'total ms':>10} "
+                 f"{'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"]
+        for row in self.summary():
+            lines.append(
+                f"{row['stage']:<10} {row['count']:>7} {row['total'] * 1000:>10.1f} "
+                f"{row['p50'] * 1000:>9.2f} {row['p95'] * 1000:>9.2f} "
+                f"{row['max'] * 1000:>9.2f}")
+        slowest = self.slowest_pages(top)
+        if slowest:
+            lines.append("")
+            lines.append(f"slowest {len(slowest)} page(s):")
+            for page, seconds in slowest:
+                lines.append(f"{seconds * 1000:>10.2f} ms  {page}")
+        return "\n".join(lines)
+
+
+class NullProfiler():
+    def stage(self, name):
+        return nullcontext()
+
+    def add(self, name, seconds):
+        pass
+
+    def add_page(self, page, seconds):
+        pass
+
+    def merge(self, other):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
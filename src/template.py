@@ -0,0 +1,57 @@
+import re
+
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class Template():
+    def __init__(self, text):
+        self.chunks = []
+        self.slots = []
+        self.placeholders = []
+        pos = 0
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            self.chunks.append(text[pos:match.start()])
+            self.slots.append(match.group(1))
+            self.placeholders.append(match.group(0))
+            pos = match.end()
+        self.chunks.append(text[pos:])
+        self.names = frozenset(self.slots)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            return cls(f.read())
+
+    def render(self, values=None, **kwargs):
+        if values is None:
+            values = kwargs
+        elif kwargs:
+            values = {**values, **kwargs}
+        parts = [""] * (len(self.chunks) + len(self.slots))
+        parts[::2] = self.chunks
+        parts[1::2] = [values.get(name, placeholder)
+                       for name, placeholder in zip(self.slots, self.placeholders)]
+        return "".join(parts)
+
+    def write(self, fp, values=None, **kwargs):
+        if values is None:
+            values = kwargs
+        elif kwargs:
+            values = {**values, **kwargs}
+        write = fp.write
+        for chunk, name, placeholder in zip(self.chunks, self.slots,
+                                            self.placeholders):
+            write(chunk)
+            value = values.get(name, placeholder)
+            if isinstance(value, str):
+                write(value)
+            else:
+                value.emit_html(write)
+        write(self.chunks[-1])
+
+    def __eq__(self, other):
+        return self.chunks == other.chunks and self.slots == other.slots
+
+    def __repr__(self):
+        return f"Template(slots: {self.slots})"
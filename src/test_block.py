@@ -1,5 +1,15 @@
+import io
 import unittest
-from block import markdown_to_blocks, block_to_block_type, markdown_to_html_node
+from block import (
+    markdown_to_blocks,
+    block_to_block_type,
+    markdown_to_html_node,
+    iter_blocks,
+    iter_typed_blocks,
+    block_to_html_node,
+    classify_block,
+)
+from fragments import DEFAULT_SIZE, configure
 
 
 class TestMarkdownToBlocks(unittest.TestCase):
@@ -188,5 +198,119 @@ class TestMarkdownToBlocks(unittest.TestCase):
         self.assertEqual(result, expected_html)
 
 
+class TestIterBlocks(unittest.TestCase):
+
+    markdown = "# Title\n\n\nSome *text*\nacross lines\n\n* a\n* b\n\n   \n\n> quote\n"
+
+    def test_matches_markdown_to_blocks(self):
+        self.assertEqual(
+            list(iter_blocks(io.StringIO(self.markdown))),
+            markdown_to_blocks(self.markdown),
+        )
+
+    def test_typed_blocks(self):
+        self.assertEqual(
+            [block_type for block_type, _ in iter_typed_blocks(io.StringIO(self.markdown))],
+            ["heading", "paragraph", "unordered_list", "quote"],
+        )
+
+    def test_is_lazy(self):
+        def lines():
+            yield "first block"
+            yield ""
+            raise AssertionError("read past the first block")
+
+        self.assertEqual(next(iter_blocks(lines())), "first block")
+
+    def test_markdown_to_html_node_from_lines(self):
+        self.assertEqual(
+            markdown_to_html_node(io.StringIO(self.markdown)).to_html(),
+            markdown_to_html_node(self.markdown).to_html(),
+        )
+
+
+class TestClassifyBlock(unittest.TestCase):
+
+    def test_returns_split_lines(self):
+        self.assertEqual(classify_block("1. a\n2. b\n3. c"),
+                         ("ordered_list", ["1. a", "2. b", "3. c"]))
+        self.assertEqual(classify_block("- a\n- b"), ("unordered_list", ["- a", "- b"]))
+        self.assertEqual(classify_block("> a\nb"), ("paragraph", ["> a", "b"]))
+
+    def test_near_misses_are_paragraphs(self):
+        for block in ["#heading", "####### seven", "*emphasis*", "- a\n* b",
+                      "1. a\n3. b", "10. ten", "1.no space", "```\nunclosed"]:
+            self.assertEqual(classify_block(block)[0], "paragraph", block)
+
+    def test_block_to_html_node_dispatch(self):
+        self.assertEqual(block_to_html_node("1. a\n2. b").to_html(),
+                         "<ol><li>a</li><li>b</li></ol>")
+        self.assertEqual(block_to_html_node("- a", "unordered_list").to_html(),
+                         "<ul><li>a</li></ul>")
+        with self.assertRaises(ValueError):
+            block_to_html_node("text", "table")
+
+
+class TestFencedCode(unittest.TestCase):
+
+    markdown = ("Intro\n\n```python\ndef f(a, b):\n    return a * b\n\n\n"
+                "print(\"<done>\" & 1)\n```\nAfter the fence")
+
+    def test_blank_lines_stay_inside_the_fence(self):
+        expected = [
+            "Intro",
+            "```python\ndef f(a, b):\n    return a * b\n\n\n"
+            "print(\"<done>\" & 1)\n```",
+            "After the fence",
+        ]
+        self.assertEqual(markdown_to_blocks(self.markdown), expected)
+        self.assertEqual(list(iter_blocks(io.StringIO(self.markdown))), expected)
+
+    def test_code_is_one_escaped_leaf(self):
+        self.assertEqual(
+            markdown_to_html_node(self.markdown).to_html(),
+            '<div><p>Intro</p><pre><code class="language-python">'
+            'def f(a, b):\n    return a * b\n\n\nprint("&lt;done&gt;" &amp; 1)\n'
+            '</code></pre><p>After the fence</p></div>',
+        )
+
+    def test_text_is_escaped_once_with_inline_cache(self):
+        configure(16)
+        self.addCleanup(configure, DEFAULT_SIZE)
+        markdown = "\n".join(["* a <b> & **c < d**"] * 3)
+        self.assertEqual(
+            markdown_to_html_node(markdown).to_html(),
+            "<div><ul>" + "<li>a &lt;b&gt; &amp; <b>c &lt; d</b></li>" * 3
+            + "</ul></div>",
+        )
+
+    def test_markup_in_code_is_literal(self):
+        self.assertEqual(
+            block_to_html_node("```\na * b `x\n[l](u)\n```").to_html(),
+            "<pre><code>a * b `x\n[l](u)\n</code></pre>",
+        )
+
+    def test_unclosed_fence_falls_back_to_paragraphs(self):
+        self.assertEqual(markdown_to_blocks("```\nfirst\n\nsecond"),
+                         ["```\nfirst", "second"])
+
+    def test_inline_code_does_not_open_a_fence(self):
+        markdown = "```x``` is inline\n\nPara two\n\n```\ncode\n```\n\nEnd"
+        self.assertEqual(markdown_to_blocks(markdown),
+                         ["```x``` is inline", "Para two", "```\ncode\n```", "End"])
+        self.assertEqual(
+            markdown_to_html_node(markdown).to_html(),
+            "<div><p><code>x</code> is inline</p><p>Para two</p>"
+            "<pre><code>code\n</code></pre><p>End</p></div>",
+        )
+
+    def test_indented_fence_closes_at_same_indent(self):
+        markdown = "  ```\n  a\n\n  b\n  ```\n\nEnd"
+        self.assertEqual(markdown_to_blocks(markdown),
+                         ["```\n  a\n\n  b\n  ```", "End"])
+        self.assertEqual(markdown_to_html_node(markdown).to_html(),
+                         "<div><pre><code>  a\n\n  b\n</code></pre><p>End</p></div>")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,64 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from buildlog import QUIET, SUMMARY, VERBOSE, BuildLog
+
+
+class TestBuildLog(unittest.TestCase):
+
+    def test_summary_level_counts_without_printing(self):
+        out = io.StringIO()
+        log = BuildLog(SUMMARY, out)
+        log.count("files_copied", message="File copied: a to b")
+        log.count("files_copied", 2)
+        self.assertEqual(log.counters, {"files_copied": 3})
+        self.assertEqual(out.getvalue(), "")
+
+    def test_verbose_prints_messages(self):
+        out = io.StringIO()
+        log = BuildLog(VERBOSE, out)
+        log.count("files_copied", message="File copied: a to b")
+        self.assertEqual(out.getvalue(), "File copied: a to b\n")
+
+    def test_quiet_only_prints_errors(self):
+        out = io.StringIO()
+        log = BuildLog(QUIET, out)
+        log.info("Build finished")
+        log.error("Error generating a.md: boom")
+        self.assertEqual(out.getvalue(), "Error generating a.md: boom\n")
+        self.assertEqual(log.errors, ["Error generating a.md: boom"])
+
+    def test_summary_line(self):
+        log = BuildLog(QUIET, io.StringIO())
+        log.count("pages_generated", 2)
+        log.count("files_copied", 3)
+        log.warning("Broken link in a.md: /b")
+        log.error("oops")
+        summary = log.summary()
+        self.assertIn("3 files copied, 2 pages generated, 1 warning(s), 1 error(s)",
+                      summary)
+        self.assertIn("nothing to do", BuildLog(QUIET).summary())
+
+    def test_write_report(self):
+        log = BuildLog(QUIET, io.StringIO())
+        log.count("pages_generated", 4)
+        log.changed("public/index.html")
+        log.removed("public/old.html")
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "report.json")
+            log.write_report(path, jobs=2)
+            with open(path) as f:
+                report = json.load(f)
+        self.assertEqual(report["counters"], {"pages_generated": 4})
+        self.assertEqual(report["errors"], [])
+        self.assertEqual(report["jobs"], 2)
+        self.assertEqual(report["changed_files"], ["public/index.html"])
+        self.assertEqual(report["removed_files"], ["public/old.html"])
+        self.assertIn("duration_seconds", report)
+
+
+if __name__ == '__main__':
+    unittest.main()
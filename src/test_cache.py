@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+from cache import RenderCache, parser_version
+
+
+class TestRenderCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = RenderCache(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip(self):
+        self.cache.put("ab12", "Title\nline", "<div><p>hi\nthere</p></div>",
+                       ["/a"], ["/b.png"])
+        self.assertEqual(
+            self.cache.get("ab12"),
+            ("Title\nline", "<div><p>hi\nthere</p></div>", ["/a"], ["/b.png"]))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 0))
+
+    def test_miss(self):
+        self.assertIsNone(self.cache.get("cd34"))
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+    def test_corrupt_entry_is_a_miss(self):
+        self.cache.put("ab12", "Title", "<div></div>")
+        with open(self.cache._path("ab12"), 'wb') as f:
+            f.write(b"garbage")
+        self.assertIsNone(self.cache.get("ab12"))
+
+    def test_entries_live_under_parser_version(self):
+        self.cache.put("ab12", "Title", "<div></div>")
+        self.assertTrue(
+            os.path.isdir(os.path.join(self.tmp.name, parser_version())))
+
+    def test_prune_removes_other_versions(self):
+        stale = os.path.join(self.tmp.name, "0123456789abcdef")
+        os.makedirs(stale)
+        self.cache.put("ab12", "Title", "<div></div>")
+        self.cache.prune()
+        self.assertFalse(os.path.exists(stale))
+        self.assertEqual(self.cache.get("ab12"), ("Title", "<div></div>", [], []))
+
+    def test_prune_keeps_only_listed_hashes(self):
+        self.cache.put("ab12", "Title", "<div></div>")
+        self.cache.put("cd34", "Old", "<div></div>")
+        self.cache.prune(["ab12"])
+        self.assertEqual(self.cache.get("ab12"), ("Title", "<div></div>", [], []))
+        self.assertIsNone(self.cache.get("cd34"))
+
+
+if __name__ == '__main__':
+    unittest.main()
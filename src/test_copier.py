@@ -0,0 +1,85 @@
+import os
+import unittest
+
+from copier import place_file, sync_files
+from plan import scan_static
+from temptree import TempTreeTestCase
+
+
+class TestSyncFiles(TempTreeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.src = self.path("static")
+        self.dst = self.path("public")
+        self.write("static/index.css", "body {}")
+        self.write("static/images/logo.png", "png")
+
+    def sync(self, previous=None, compare="mtime", link="copy"):
+        plan = scan_static(self.src, self.dst)
+        created = plan.make_directories()
+        entries, copied, removed = sync_files(
+            plan.files, self.dst, previous, compare, link)
+        return entries, created, copied, removed
+
+    def test_first_sync_copies_everything(self):
+        entries, created, copied, removed = self.sync()
+        self.assertEqual(len(copied), 2)
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(removed, [])
+        self.assertTrue(os.path.exists(os.path.join(self.dst, "images", "logo.png")))
+
+    def test_unchanged_files_are_skipped(self):
+        entries, _, _, _ = self.sync()
+        _, created, copied, _ = self.sync(entries)
+        self.assertEqual(created, [])
+        self.assertEqual(copied, [])
+
+    def test_changed_file_is_copied(self):
+        entries, _, _, _ = self.sync()
+        self.write("static/index.css", "body { color: red; }")
+        _, _, copied, _ = self.sync(entries)
+        self.assertEqual([d for _, d in copied], [os.path.join(self.dst, "index.css")])
+
+    def test_hash_mode_ignores_touched_files(self):
+        entries, _, _, _ = self.sync(compare="hash")
+        path = os.path.join(self.src, "index.css")
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        _, _, copied, _ = self.sync(entries, compare="hash")
+        self.assertEqual(copied, [])
+        _, _, copied, _ = self.sync(entries, compare="mtime")
+        self.assertEqual(len(copied), 1)
+
+    def test_stale_files_removed_and_other_outputs_kept(self):
+        entries, _, _, _ = self.sync()
+        page = self.write("public/index.html", "<html></html>")
+        os.remove(os.path.join(self.src, "images", "logo.png"))
+        entries, _, _, removed = self.sync(entries)
+        self.assertEqual(removed, [os.path.join(self.dst, "images", "logo.png")])
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "images")))
+        self.assertTrue(os.path.exists(page))
+        self.assertEqual(len(entries), 1)
+
+    def test_hardlink(self):
+        self.sync(link="hardlink")
+        src_stat = os.stat(os.path.join(self.src, "index.css"))
+        dst_stat = os.stat(os.path.join(self.dst, "index.css"))
+        self.assertEqual(src_stat.st_ino, dst_stat.st_ino)
+
+    def test_reflink_falls_back_to_copy(self):
+        src = os.path.join(self.src, "index.css")
+        dst = self.path("copy.css")
+        place_file(src, dst, link="reflink")
+        with open(dst) as f:
+            self.assertEqual(f.read(), "body {}")
+
+    def test_invalid_modes(self):
+        with self.assertRaises(ValueError):
+            sync_files([], self.dst, compare="size")
+        with self.assertRaises(ValueError):
+            place_file("a", "b", link="symlink")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+from escaping import Markup, escape_attr, escape_text
+
+
+class TestEscaping(unittest.TestCase):
+
+    def test_plain_text_is_returned_as_is(self):
+        text = "nothing special here"
+        self.assertIs(escape_text(text), text)
+        self.assertIs(escape_attr(text), text)
+
+    def test_text(self):
+        self.assertEqual(escape_text('a < b && c > "d"'),
+                         'a &lt; b &amp;&amp; c &gt; "d"')
+
+    def test_attr(self):
+        self.assertEqual(escape_attr('/search?q="x"&page=<2>'),
+                         "/search?q=&quot;x&quot;&amp;page=&lt;2&gt;")
+
+    def test_markup_is_not_escaped_again(self):
+        html = Markup("<b>bold</b> &amp; more")
+        self.assertIs(escape_text(html), html)
+        self.assertIs(escape_attr(html), html)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from block import markdown_to_html_node
+from fragments import DEFAULT_SIZE, FragmentCache, configure, inline_cache
+
+
+class TestFragmentCache(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        cache = FragmentCache(4)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", "<b>a</b>")
+        self.assertEqual(cache.get("a"), "<b>a</b>")
+        self.assertEqual(cache.stats(), (1, 1))
+
+    def test_evicts_least_recently_used(self):
+        cache = FragmentCache(2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+        self.assertEqual(list(cache.entries), ["a", "c"])
+        cache.resize(1)
+        self.assertEqual(list(cache.entries), ["c"])
+
+    def test_admits_on_second_sighting(self):
+        cache = FragmentCache(4)
+        self.assertFalse(cache.admit("a"))
+        self.assertTrue(cache.admit("a"))
+        self.assertFalse(cache.admit("b"))
+
+    def test_zero_size_stores_nothing(self):
+        cache = FragmentCache(0)
+        cache.put("a", "1")
+        self.assertEqual(len(cache.entries), 0)
+
+
+class TestInlineMemoization(unittest.TestCase):
+
+    def tearDown(self):
+        configure(DEFAULT_SIZE)
+
+    def test_cached_output_matches_uncached(self):
+        markdown = ("# Guide\n\n* **Install** the `tool`\n* [Docs](/docs)\n\n"
+                    "* **Install** the `tool`\n\n> quoted *text*")
+        configure(0)
+        uncached = markdown_to_html_node(markdown).to_html()
+        configure(16)
+        before = inline_cache.stats()
+        first = markdown_to_html_node(markdown).to_html()
+        second = markdown_to_html_node(markdown).to_html()
+        third = markdown_to_html_node(markdown).to_html()
+        hits, misses = inline_cache.stats()
+        self.assertEqual(first, uncached)
+        self.assertEqual(second, uncached)
+        self.assertEqual(third, uncached)
+        self.assertGreaterEqual(hits - before[0], 5)
+
+    def test_errors_are_not_cached(self):
+        configure(16)
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                markdown_to_html_node("**unclosed")
+
+
+if __name__ == '__main__':
+    unittest.main()
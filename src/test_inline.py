@@ -182,6 +182,45 @@ class TestSplitNodesDelimiter(unittest.TestCase):
             nodes,
         )
 
+    def test_text_to_textnodes_plain(self):
+        self.assertListEqual(
+            [TextNode("Just prose, no markup!", TextType.TEXT)],
+            text_to_textnodes("Just prose, no markup!"),
+        )
+        self.assertListEqual([], text_to_textnodes(""))
+
+    def test_text_to_textnodes_unclosed(self):
+        with self.assertRaises(ValueError) as context:
+            text_to_textnodes("This is **unclosed")
+        self.assertEqual(
+            str(context.exception),
+            "Invalid markdown, formatted section not closed",
+        )
+
+    def test_text_to_textnodes_literal_brackets(self):
+        self.assertListEqual(
+            [
+                TextNode("Wow! [not a link] and ![", TextType.TEXT),
+                TextNode("link", TextType.LINK, "/a"),
+            ],
+            text_to_textnodes("Wow! [not a link] and ![[link](/a)"),
+        )
+
+    def test_text_to_textnodes_link_url_with_delimiters(self):
+        self.assertListEqual(
+            [
+                TextNode("see ", TextType.TEXT),
+                TextNode("docs", TextType.LINK, "https://x.dev/*/`a`"),
+            ],
+            text_to_textnodes("see [docs](https://x.dev/*/`a`)"),
+        )
+
+    def test_text_to_textnodes_many_links(self):
+        text = " ".join(f"[l{i}](/p{i})" for i in range(2000))
+        nodes = text_to_textnodes(text)
+        self.assertEqual(len(nodes), 3999)
+        self.assertEqual(nodes[-1], TextNode("l1999", TextType.LINK, "/p1999"))
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -1,4 +1,5 @@
 from LeafNode import LeafNode
+from escaping import Markup
 
 import unittest
 
@@ -24,6 +25,28 @@ class TestLeafNode(unittest.TestCase):
         node = LeafNode("img", "", {"src": "image.png"})
         self.assertEqual(node.to_html(), '<img src="image.png"></img>')
 
+    def test_leaf_nodes_share_empty_children(self):
+        first = LeafNode("b", "one")
+        second = LeafNode(None, "two")
+        self.assertIs(first.children, second.children)
+        self.assertEqual(len(first.children), 0)
+
+    def test_leaf_node_has_no_instance_dict(self):
+        node = LeafNode("p", "text")
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.extra = 1
+
+    def test_leaf_node_escapes_value_and_props(self):
+        node = LeafNode("a", "x < y & z", {"href": '/q?a=1&b="2"'})
+        self.assertEqual(node.to_html(),
+                         '<a href="/q?a=1&amp;b=&quot;2&quot;">x &lt; y &amp; z</a>')
+        self.assertEqual(LeafNode(None, "<raw>").to_html(), "&lt;raw&gt;")
+
+    def test_leaf_node_keeps_markup(self):
+        self.assertEqual(LeafNode(None, Markup("<b>safe</b>")).to_html(),
+                         "<b>safe</b>")
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,54 @@
+import os
+import unittest
+
+from block import markdown_to_html_node
+from links import check_references, page_references, resolve
+from paths import PathMap
+
+
+class TestLinks(unittest.TestCase):
+
+    def test_page_references(self):
+        links, images = page_references(markdown_to_html_node(
+            "[a](/a) and ![logo](/logo.png)\n\n[again](/a) [b](b.html)"))
+        self.assertEqual(links, ["/a", "b.html"])
+        self.assertEqual(images, ["/logo.png"])
+
+    def test_page_references_only_rendered_links(self):
+        links, images = page_references(markdown_to_html_node(
+            "[a](/a) `[span](/span)` **[bold](/bold)**\n\n```\n"
+            "[fenced](/fenced)\n![shot](/shot.png)\n```\n\n![logo](/logo.png)"))
+        self.assertEqual(links, ["/a"])
+        self.assertEqual(images, ["/logo.png"])
+
+    def test_resolve(self):
+        page = os.path.join("public", "blog", "post.html")
+        self.assertEqual(resolve("https://example.com/x", page, "public"), [])
+        self.assertEqual(resolve("#top", page, "public"), [])
+        self.assertEqual(resolve("/images/a.png?v=1", page, "public"),
+                         [os.path.join("public", "images", "a.png")])
+        self.assertEqual(resolve("other.html#part", page, "public"),
+                         [os.path.join("public", "blog", "other.html")])
+        self.assertEqual(resolve("../../", page, "public"),
+                         [os.path.join("public", "index.html")])
+        self.assertEqual(resolve("/about", page, "public"), [
+            os.path.join("public", "about", "index.html"),
+            os.path.join("public", "about.html")])
+
+    def test_check_references(self):
+        paths = PathMap("content", "public")
+        pages = {}
+        for source, links, images in [
+                ("content/index.md", ["/blog/post.html", "/missing/"], ["/logo.png"]),
+                ("content/blog/post.md", ["/", "https://example.com"], ["/gone.png"])]:
+            pages[source] = {"output": paths.add(source), "links": links,
+                             "images": images}
+        static = {"static/logo.png": {"output": "public/logo.png"}}
+        self.assertEqual(check_references(pages, paths, static, "public"), [
+            ("content/index.md", "link", "/missing/"),
+            ("content/blog/post.md", "image", "/gone.png"),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,27 @@
+import contextlib
+import io
+import os
+import tempfile
 import unittest
-from main import extract_title
+from unittest.mock import patch
+from buildlog import QUIET, VERBOSE, BuildLog
+from cache import RenderCache
+from fragments import DEFAULT_SIZE, configure
+from main import (
+    extract_title,
+    generate_page,
+    generate_pages_recursive,
+    main,
+    recursive_copy,
+    render_many,
+    watch_site,
+)
+from manifest import BuildManifest, hash_file
+from paths import PathMap
+from plan import scan_site
+from profiling import Profiler
+from template import Template
+from temptree import TempTreeTestCase
 
 
 class TestExtractTitle(unittest.TestCase):
@@ -35,5 +57,374 @@ class TestExtractTitle(unittest.TestCase):
                          "Title must have h1 tag")
 
 
+class TestRenderMany(unittest.TestCase):
+
+    def test_snippets_without_template(self):
+        rows = iter(["Some **bold** text", "* a\n* b", ["# Lines\n", "\n", "body\n"]])
+        self.assertEqual(list(render_many(rows)), [
+            "<div><p>Some <b>bold</b> text</p></div>",
+            "<div><ul><li>a</li><li>b</li></ul></div>",
+            "<div><h1>Lines</h1><p>body</p></div>",
+        ])
+
+    def test_matches_generate_page(self):
+        template = Template("<title>{{ Title }}</title>{{ Content }}")
+        markdown = "# Home\n\n[About](/about.html) and `code`"
+        with tempfile.TemporaryDirectory() as root:
+            source = os.path.join(root, "index.md")
+            dest = os.path.join(root, "index.html")
+            with open(source, 'w') as f:
+                f.write(markdown)
+            generate_page(source, None, dest, template)
+            with open(dest) as f:
+                expected = f.read()
+        self.assertEqual(next(render_many([markdown], template)), expected)
+
+    def test_is_lazy(self):
+        pages = render_many(["# One", "**unclosed"], Template("{{ Title }}"))
+        self.assertEqual(next(pages), "One")
+        with self.assertRaises(ValueError):
+            next(pages)
+
+
+class TestIncrementalBuild(TempTreeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.static = os.path.join(self.root, "static")
+        self.public = os.path.join(self.root, "public")
+        self.template = self.write("template.html", "<h1>{{ Title }}</h1>{{ Content }}")
+        self.write("content/index.md", "# Home\n\nWelcome")
+        self.write("content/blog/post.md", "# Post\n\nBody")
+        self.write("static/site.css", "body {}")
+        self.manifest_path = os.path.join(self.root, "manifest.json")
+
+    def build(self):
+        manifest = BuildManifest(self.manifest_path)
+        out = io.StringIO()
+        log = BuildLog(VERBOSE, out)
+        plan = scan_site(self.content, self.static, self.public)
+        recursive_copy(self.static, self.public, manifest, log=log, plan=plan)
+        generate_pages_recursive(
+            self.content, self.template, self.public, manifest, log=log,
+            plan=plan)
+        manifest.save()
+        return out.getvalue()
+
+    def test_watch_rebuild_reuses_build_options(self):
+        self.build()
+        manifest = BuildManifest(self.manifest_path)
+        self.write("content/index.md", "# Home\n\nEdited")
+        self.write("static/site.css", "body { margin: 0 }")
+        changed = [os.path.join(self.content, "index.md"),
+                   os.path.join(self.static, "site.css")]
+        with patch("watch.serve"), \
+                patch("watch.Watcher.run", lambda _, on_change: on_change(changed, [])), \
+                patch("main.recursive_copy", wraps=recursive_copy) as copy:
+            watch_site(self.content, self.static, self.template, self.public,
+                       manifest, log=BuildLog(QUIET), compare="hash", link="hardlink")
+        self.assertEqual(copy.call_args.args[3:5], ("hash", "hardlink"))
+        with open(os.path.join(self.public, "index.html")) as f:
+            self.assertIn("Edited", f.read())
+        entry = manifest.pages[changed[0]]
+        self.assertEqual(entry["hash"], hash_file(changed[0]))
+
+    def test_watch_rebuilds_each_page_and_scopes_the_log(self):
+        index = os.path.join(self.content, "index.md")
+        post = self.write("content/blog/post.md", "# Post\n\n[gone](/gone.html)")
+        self.build()
+        manifest = BuildManifest(self.manifest_path)
+        log = BuildLog(QUIET, io.StringIO())
+
+        def run(_, on_change):
+            self.write("content/index.md", "# Home\n\n**unclosed")
+            self.write("content/blog/post.md", "# Post\n\nOne [gone](/gone.html)")
+            on_change([index, post], [])
+            self.assertEqual(len(log.errors), 1)
+            self.assertEqual(log.warnings, [])
+            self.write("content/blog/post.md", "# Post\n\nTwo [gone](/gone.html)")
+            on_change([post], [])
+
+        with patch("watch.serve"), patch("watch.Watcher.run", run):
+            watch_site(self.content, self.static, self.template, self.public,
+                       manifest, log=log)
+        self.assertEqual(log.errors, [])
+        self.assertEqual(log.warnings, [])
+        self.assertEqual(log.changed_files,
+                         [os.path.join(self.public, "blog", "post.html")])
+        with open(os.path.join(self.public, "blog", "post.html")) as f:
+            self.assertIn("Two", f.read())
+
+    def test_unchanged_build_does_nothing(self):
+        self.build()
+        self.assertEqual(self.build(), "")
+
+    def test_only_changed_page_is_rebuilt(self):
+        self.build()
+        self.write("content/blog/post.md", "# Post\n\nEdited")
+        log = self.build()
+        self.assertIn("post.md", log)
+        self.assertNotIn("index.md", log)
+        with open(os.path.join(self.public, "blog", "post.html")) as f:
+            self.assertIn("Edited", f.read())
+
+    def test_template_change_rebuilds_everything(self):
+        self.build()
+        self.write("template.html", "<h2>{{ Title }}</h2>{{ Content }}")
+        log = self.build()
+        self.assertIn("post.md", log)
+        self.assertIn("index.md", log)
+
+    def test_interrupted_template_change_is_rebuilt_next_time(self):
+        self.build()
+        self.write("template.html", "<h2>{{ Title }}</h2>{{ Content }}")
+        manifest = BuildManifest(self.manifest_path)
+        with patch("main.render_pages", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                generate_pages_recursive(
+                    self.content, self.template, self.public, manifest)
+        manifest.save()
+        log = self.build()
+        self.assertIn("post.md", log)
+        self.assertIn("index.md", log)
+
+    def test_template_change_reuses_render_cache(self):
+        cache = RenderCache(os.path.join(self.root, "render"))
+        manifest = BuildManifest(self.manifest_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_recursive(
+                self.content, self.template, self.public, manifest, cache=cache)
+        self.write("template.html", "<h2>{{ Title }}</h2>{{ Content }}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            with patch("main.markdown_to_html_node") as parse:
+                generate_pages_recursive(
+                    self.content, self.template, self.public, manifest, cache=cache)
+        parse.assert_not_called()
+        self.assertEqual(cache.hits, 2)
+        with open(os.path.join(self.public, "index.html")) as f:
+            self.assertEqual(f.read(), "<h2>Home</h2><div><h1>Home</h1><p>Welcome</p></div>")
+
+    def test_identical_output_is_not_rewritten(self):
+        self.build()
+        output = os.path.join(self.public, "index.html")
+        os.utime(output, ns=(0, 0))
+        self.write("content/index.md", "# Home\n\nWelcome\n\n\n")
+        manifest = BuildManifest(self.manifest_path)
+        log = BuildLog(VERBOSE, io.StringIO())
+        generate_pages_recursive(
+            self.content, self.template, self.public, manifest, log=log)
+        self.assertEqual(log.counters["pages_generated"], 1)
+        self.assertEqual(log.counters["pages_unchanged"], 1)
+        self.assertEqual(log.changed_files, [])
+        self.assertEqual(os.stat(output).st_mtime_ns, 0)
+
+    def test_switching_to_pretty_urls_moves_outputs(self):
+        self.build()
+        manifest = BuildManifest(self.manifest_path)
+        paths = PathMap(self.content, self.public, pretty=True)
+        generate_pages_recursive(
+            self.content, self.template, self.public, manifest, paths=paths)
+        self.assertTrue(os.path.exists(
+            os.path.join(self.public, "blog", "post", "index.html")))
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog", "post.html")))
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.html")))
+
+    def test_freshness_is_checked_by_the_render_workers(self):
+        post = os.path.join(self.content, "blog", "post.md")
+        for options in ({"io_threads": 2}, {"jobs": 2}):
+            self.build()
+            self.write("content/blog/post.md", f"# Post\n\n{options}")
+            manifest = BuildManifest(self.manifest_path)
+            log = BuildLog(VERBOSE, io.StringIO())
+            generate_pages_recursive(self.content, self.template, self.public,
+                                     manifest, log=log, **options)
+            self.assertEqual(log.counters["pages_skipped"], 1)
+            self.assertEqual(log.counters["pages_generated"], 1)
+            self.assertEqual(manifest.pages[post]["hash"], hash_file(post))
+
+    def test_manifest_indexes_only_rendered_links(self):
+        index = self.write("content/index.md", "# Home\n\n[post](/blog/post.html) "
+                           "**[bold](/missing)** `[code](/missing)`")
+        out = self.build()
+        self.assertNotIn("Broken", out)
+        manifest = BuildManifest(self.manifest_path)
+        self.assertEqual(manifest.pages[index]["links"], ["/blog/post.html"])
+
+    def test_broken_links_are_reported_across_pages(self):
+        index = self.write("content/index.md", "# Home\n\n[post](/blog/post.html) "
+                           "[about](/about/) ![css](/site.css)")
+        out = self.build()
+        self.assertIn(f"Broken link in {index}: /about/", out)
+        self.assertEqual(out.count("Broken"), 1)
+        self.write("content/about/index.md", "# About")
+        self.assertNotIn("Broken", self.build())
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        out = self.build()
+        self.assertIn(f"Broken link in {index}: /blog/post.html", out)
+        self.assertEqual(out.count("Broken"), 1)
+
+    def test_removed_sources_are_deleted(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        os.remove(os.path.join(self.static, "site.css"))
+        self.build()
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog")))
+        self.assertFalse(os.path.exists(os.path.join(self.public, "site.css")))
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.html")))
+
+
+class TestParallelBuild(TempTreeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.template = self.write("template.html",
+                                   "<title>{{ Title }}</title>{{ Content }}")
+        for i in range(12):
+            self.write(f"content/section{i % 3}/page{i}.md",
+                       f"# Page {i}\n\nSome **bold** text {i}\n\n* a\n* b")
+
+    def build(self, dest, jobs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_recursive(
+                os.path.join(self.root, "content"), self.template, dest, jobs=jobs)
+        outputs = {}
+        for dirpath, _, filenames in os.walk(dest):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                with open(path, 'rb') as f:
+                    outputs[os.path.relpath(path, dest)] = f.read()
+        return outputs
+
+    def test_parallel_output_matches_serial(self):
+        serial = self.build(os.path.join(self.root, "serial"), 1)
+        parallel = self.build(os.path.join(self.root, "parallel"), 4)
+        self.assertEqual(len(serial), 12)
+        self.assertEqual(serial, parallel)
+
+    def test_io_pipeline_output_matches_serial(self):
+        serial = self.build(os.path.join(self.root, "serial"), 1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_recursive(
+                os.path.join(self.root, "content"), self.template,
+                os.path.join(self.root, "pipelined"), io_threads=3)
+        for name, data in serial.items():
+            with open(os.path.join(self.root, "pipelined", name), 'rb') as f:
+                self.assertEqual(f.read(), data)
+
+    def test_profiled_parallel_build_merges_worker_stages(self):
+        profiler = Profiler()
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_recursive(
+                os.path.join(self.root, "content"), self.template,
+                os.path.join(self.root, "public"), jobs=4, profiler=profiler)
+        for stage in ("scan", "read", "parse", "to_html", "template", "write"):
+            self.assertIn(stage, profiler.samples)
+        self.assertEqual(len(profiler.samples["parse"]), 12)
+        self.assertEqual(len(profiler.pages), 12)
+        serial = self.build(os.path.join(self.root, "serial"), 1)
+        path = os.path.join(self.root, "public", "section0", "page0.html")
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), serial[os.path.join("section0", "page0.html")])
+
+    def test_inline_cache_stats_are_collected_from_workers(self):
+        configure(64)
+        self.addCleanup(configure, DEFAULT_SIZE)
+        for jobs in (1, 4):
+            log = BuildLog(VERBOSE, io.StringIO())
+            generate_pages_recursive(
+                os.path.join(self.root, "content"), self.template,
+                os.path.join(self.root, f"public{jobs}"), jobs=jobs, log=log)
+            hits = log.counters["inline_cache_hits"]
+            misses = log.counters["inline_cache_misses"]
+            self.assertEqual(hits + misses, 48)
+            self.assertGreater(hits, 0)
+
+    def test_render_cache_stats_are_collected_from_workers(self):
+        cache = RenderCache(os.path.join(self.root, "render"))
+        for expected in ((0, 12), (12, 0)):
+            log = BuildLog(VERBOSE, io.StringIO())
+            generate_pages_recursive(
+                os.path.join(self.root, "content"), self.template,
+                os.path.join(self.root, "public"), jobs=4, cache=cache, log=log)
+            self.assertEqual((log.counters["render_cache_hits"],
+                              log.counters["render_cache_misses"]), expected)
+
+    def test_parallel_reports_every_failed_page(self):
+        self.write("content/bad1.md", "no title here")
+        self.write("content/bad2.md", "**unclosed\n\n# Title")
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            with self.assertRaises(ValueError) as context:
+                generate_pages_recursive(
+                    os.path.join(self.root, "content"), self.template,
+                    os.path.join(self.root, "public"), jobs=4)
+        self.assertEqual(str(context.exception), "2 page(s) failed to generate")
+        self.assertIn("bad1.md", out.getvalue())
+        self.assertIn("bad2.md", out.getvalue())
+        self.assertTrue(os.path.exists(
+            os.path.join(self.root, "public", "section0", "page0.html")))
+
+
+class TestCommandLine(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        for name, text in [
+                ("template.html", "<title>{{ Title }}</title>{{ Content }}"),
+                ("content/index.md", "# Home\n\n[About](/about.html)"),
+                ("content/about.md", "# About\n\n![logo](/logo.png)"),
+                ("static/logo.png", "png")]:
+            os.makedirs(os.path.dirname(name) or ".", exist_ok=True)
+            with open(name, 'w') as f:
+                f.write(text)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def run_main(self, *argv):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            code = main(list(argv))
+        return code, out.getvalue()
+
+    def test_build_is_the_default_command(self):
+        self.assertEqual(self.run_main("-q"), (0, ""))
+        self.assertTrue(os.path.exists("public/about.html"))
+        code, out = self.run_main("build")
+        self.assertEqual(code, 0)
+        self.assertIn("2 pages skipped", out)
+
+    def test_failed_build_returns_an_error_code(self):
+        with open("content/broken.md", 'w') as f:
+            f.write("# Broken\n\n**unclosed")
+        code, out = self.run_main("-q")
+        self.assertEqual(code, 1)
+        self.assertIn("Error generating content/broken.md", out)
+        self.assertNotIn("Traceback", out)
+        self.assertTrue(os.path.exists("public/about.html"))
+
+    def test_render_one(self):
+        code, out = self.run_main("render-one", "content/about.md")
+        self.assertEqual(code, 0)
+        self.assertEqual(out, '<title>About</title><div><h1>About</h1><p>'
+                              '<img src="/logo.png" alt="logo"></img></p></div>')
+        self.run_main("render-one", "content/index.md", "-o", "out/index.html")
+        self.assertTrue(os.path.exists("out/index.html"))
+        self.assertFalse(os.path.exists("public"))
+
+    def test_check(self):
+        code, out = self.run_main("check")
+        self.assertEqual(code, 0)
+        self.assertIn("Check finished", out)
+        os.remove("static/logo.png")
+        code, out = self.run_main("check")
+        self.assertEqual(code, 1)
+        self.assertIn("Broken image in content/about.md: /logo.png", out)
+        self.assertFalse(os.path.exists("public"))
+
+
 if __name__ == '__main__':
     unittest.main()
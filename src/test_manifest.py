@@ -0,0 +1,49 @@
+import os
+import unittest
+
+from manifest import BuildManifest, hash_file, is_fresh, remove_output
+from temptree import TempTreeTestCase
+
+
+class TestBuildManifest(TempTreeTestCase):
+
+    def test_save_and_load(self):
+        path = os.path.join(self.root, "cache", "manifest.json")
+        manifest = BuildManifest(path)
+        manifest.template = "abc"
+        manifest.pages["a.md"] = {"hash": "123", "output": "a.html"}
+        manifest.save()
+        loaded = BuildManifest(path)
+        self.assertEqual(loaded.template, "abc")
+        self.assertEqual(loaded.pages, {"a.md": {"hash": "123", "output": "a.html"}})
+
+    def test_corrupt_manifest_is_ignored(self):
+        path = self.write("manifest.json", "{not json")
+        manifest = BuildManifest(path)
+        self.assertEqual(manifest.pages, {})
+        self.assertIsNone(manifest.template)
+
+    def test_hash_file_changes_with_content(self):
+        path = self.write("a.md", "# one")
+        first = hash_file(path)
+        self.write("a.md", "# two")
+        self.assertNotEqual(first, hash_file(path))
+
+    def test_is_fresh(self):
+        output = self.write("out/a.html", "<p></p>")
+        entry = {"hash": "123", "output": output}
+        self.assertTrue(is_fresh(entry, "123", output))
+        self.assertFalse(is_fresh(entry, "456", output))
+        self.assertFalse(is_fresh(None, "123", output))
+        os.remove(output)
+        self.assertFalse(is_fresh(entry, "123", output))
+
+    def test_remove_output_prunes_empty_dirs(self):
+        output = self.write("out/nested/deep/a.html", "<p></p>")
+        remove_output(output, os.path.join(self.root, "out"))
+        self.assertFalse(os.path.exists(os.path.join(self.root, "out", "nested")))
+        self.assertTrue(os.path.isdir(os.path.join(self.root, "out")))
+
+
+if __name__ == '__main__':
+    unittest.main()
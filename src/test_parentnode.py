@@ -1,3 +1,4 @@
+import io
 import unittest
 from unittest.mock import MagicMock
 from htmlnode import HTMLNode
@@ -120,6 +121,41 @@ class TestParentNode(unittest.TestCase):
             "<h2><b>Bold text</b>Normal text<i>italic text</i>Normal text</h2>",
         )
 
+    def test_to_html_long_list(self):
+        items = [ParentNode("li", [LeafNode(None, f"item {i}")]) for i in range(5000)]
+        node = ParentNode("ul", items)
+        expected = "<ul>" + "".join(f"<li>item {i}</li>" for i in range(5000)) + "</ul>"
+        self.assertEqual(node.to_html(), expected)
+
+    def test_to_html_deep_nesting(self):
+        node = LeafNode(None, "deep")
+        for _ in range(5000):
+            node = ParentNode("div", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<div>" * 5000 + "deep"))
+        self.assertTrue(html.endswith("</div>" * 5000))
+
+    def test_to_html_invalid_nested_child(self):
+        child = ParentNode("span", [LeafNode(None, "x")])
+        child.children = []
+        with self.assertRaises(ValueError) as context:
+            ParentNode("div", [child]).to_html()
+        self.assertEqual(str(context.exception), "parent node needs children")
+
+    def test_write_html(self):
+        node = ParentNode(
+            "p",
+            [LeafNode("b", "Bold text"), LeafNode("a", "link", {"href": "/x"})],
+            {"class": "lead"},
+        )
+        fp = io.StringIO()
+        node.write_html(fp)
+        self.assertEqual(fp.getvalue(), node.to_html())
+        self.assertEqual(
+            fp.getvalue(),
+            '<p class="lead"><b>Bold text</b><a href="/x">link</a></p>',
+        )
+
 if __name__ == '__main__':
     unittest.main()
 
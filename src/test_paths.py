@@ -0,0 +1,43 @@
+import os
+import unittest
+
+from paths import PathMap
+
+
+class TestPathMap(unittest.TestCase):
+
+    def test_only_the_suffix_is_replaced(self):
+        paths = PathMap("content", "public")
+        self.assertEqual(paths.add("content/foo.md.bak/readme.md"),
+                         os.path.join("public", "foo.md.bak", "readme.html"))
+        self.assertEqual(paths.output_for("content/a.mdx.md"),
+                         os.path.join("public", "a.mdx.html"))
+
+    def test_pretty_urls(self):
+        paths = PathMap("content", "public", pretty=True)
+        self.assertEqual(paths.add("content/blog/post.md"),
+                         os.path.join("public", "blog", "post", "index.html"))
+        self.assertEqual(paths.add("content/blog/index.md"),
+                         os.path.join("public", "blog", "index.html"))
+
+    def test_reverse_index(self):
+        paths = PathMap("content", "public/")
+        output = paths.add("content/blog/post.md")
+        self.assertEqual(paths.source_for(output), "content/blog/post.md")
+        self.assertEqual(paths.source_for("public/blog/post.html"),
+                         "content/blog/post.md")
+        self.assertIsNone(paths.source_for("public/missing.html"))
+        self.assertEqual(paths.discard("content/blog/post.md"), output)
+        self.assertIsNone(paths.source_for(output))
+
+    def test_collisions_and_non_pages(self):
+        paths = PathMap("content", "public", pretty=True)
+        paths.add("content/about.md")
+        with self.assertRaises(ValueError):
+            paths.add("content/about/index.md")
+        with self.assertRaises(ValueError):
+            paths.output_for("content/notes.txt")
+
+
+if __name__ == '__main__':
+    unittest.main()
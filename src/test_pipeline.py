@@ -0,0 +1,68 @@
+import threading
+import unittest
+
+from pipeline import run_pipeline
+
+
+class TestRunPipeline(unittest.TestCase):
+
+    def test_renders_in_order_and_writes_everything(self):
+        rendered = []
+        written = {}
+
+        def render(item, data):
+            rendered.append(item)
+            return data.upper()
+
+        errors = run_pipeline(
+            range(50), lambda item: f"page {item}", render,
+            written.__setitem__, readers=4, depth=3)
+        self.assertEqual(errors, {})
+        self.assertEqual(rendered, list(range(50)))
+        self.assertEqual(written, {i: f"PAGE {i}" for i in range(50)})
+
+    def test_errors_from_every_stage(self):
+        def read(item):
+            if item == 1:
+                raise OSError("cannot read")
+            return item
+
+        def render(item, data):
+            if item == 2:
+                raise ValueError("bad markdown")
+            return data
+
+        def write(item, result):
+            if item == 3:
+                raise OSError("disk full")
+
+        errors = run_pipeline(range(5), read, render, write, readers=2, depth=2)
+        self.assertEqual(errors, {
+            1: "OSError: cannot read",
+            2: "ValueError: bad markdown",
+            3: "OSError: disk full",
+        })
+
+    def test_prefetch_is_bounded(self):
+        lock = threading.Lock()
+        state = {"read": 0, "rendered": 0, "max_ahead": 0}
+
+        def read(item):
+            with lock:
+                state["read"] += 1
+                ahead = state["read"] - state["rendered"]
+                state["max_ahead"] = max(state["max_ahead"], ahead)
+            return item
+
+        def render(item, data):
+            with lock:
+                state["rendered"] += 1
+            return data
+
+        run_pipeline(range(200), read, render, lambda item, result: None,
+                     readers=4, depth=5)
+        self.assertLessEqual(state["max_ahead"], 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import unittest
+
+from paths import PathMap
+from plan import BuildPlan, scan_pages, scan_site, scan_static
+from temptree import TempTreeTestCase
+
+
+class TestBuildPlan(TempTreeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write("content/index.md", "# Home")
+        self.write("content/blog/post.md", "# Post")
+        self.write("content/blog/notes.txt", "not a page")
+        self.write("static/index.css", "body {}")
+        self.write("static/images/logo.png", "png")
+        os.makedirs(self.path("static/empty"))
+
+    def test_scan_pages(self):
+        plan = scan_pages(self.path("content"), self.path("public"))
+        self.assertEqual(plan.pages, [
+            (self.path("content/index.md"), self.path("public/index.html")),
+            (self.path("content/blog/post.md"), self.path("public/blog/post.html")),
+        ])
+        self.assertEqual(plan.directories,
+                         [self.path("public"), self.path("public/blog")])
+        self.assertEqual(plan.paths.source_for(self.path("public/blog/post.html")),
+                         self.path("content/blog/post.md"))
+
+    def test_scan_pages_with_pretty_urls(self):
+        paths = PathMap(self.path("content"), self.path("public"), pretty=True)
+        plan = scan_pages(self.path("content"), self.path("public"), paths=paths)
+        self.assertEqual(plan.pages[1][1], self.path("public/blog/post/index.html"))
+        self.assertIn(self.path("public/blog/post"), plan.directories)
+
+    def test_scan_static_keeps_stat_results(self):
+        plan = scan_static(self.path("static"), self.path("public"))
+        self.assertEqual([dst for _, dst, _ in plan.files], [
+            self.path("public/index.css"), self.path("public/images/logo.png")])
+        self.assertEqual(plan.files[0][2].st_size, len("body {}"))
+        self.assertEqual(plan.directories, [
+            self.path("public"), self.path("public/empty"),
+            self.path("public/images")])
+
+    def test_make_directories_once(self):
+        plan = scan_site(self.path("content"), self.path("static"),
+                         self.path("public"))
+        self.assertEqual(len(plan.directories), 4)
+        self.assertEqual(plan.make_directories(), plan.directories)
+        self.assertTrue(os.path.isdir(self.path("public/blog")))
+        self.assertEqual(plan.make_directories(), [])
+        plan.add_directory(self.path("public/a/b"))
+        self.assertEqual(plan.make_directories(), [self.path("public/a/b")])
+
+    def test_describe_is_a_dry_run(self):
+        plan = scan_site(self.path("content"), self.path("static"),
+                         self.path("public"))
+        lines = plan.describe()
+        self.assertIn(f"mkdir  {self.path('public/blog')}", lines)
+        self.assertIn(f"copy   {self.path('static/index.css')} -> "
+                      f"{self.path('public/index.css')}", lines)
+        self.assertIn(f"render {self.path('content/blog/post.md')} -> "
+                      f"{self.path('public/blog/post.html')}", lines)
+        self.assertFalse(os.path.exists(self.path("public")))
+
+    def test_empty_plan(self):
+        self.assertEqual(BuildPlan().describe(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
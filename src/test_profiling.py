@@ -0,0 +1,61 @@
+import unittest
+
+from profiling import NULL_PROFILER, Profiler, percentile
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(values, 0.50), 50.0)
+        self.assertEqual(percentile(values, 0.95), 95.0)
+        self.assertEqual(percentile([3.0], 0.95), 3.0)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_stage_records_samples(self):
+        profiler = Profiler()
+        with profiler.stage("parse"):
+            pass
+        with profiler.stage("parse"):
+            pass
+        self.assertEqual(len(profiler.samples["parse"]), 2)
+
+    def test_stage_records_on_error(self):
+        profiler = Profiler()
+        with self.assertRaises(ValueError):
+            with profiler.stage("parse"):
+                raise ValueError("boom")
+        self.assertEqual(len(profiler.samples["parse"]), 1)
+
+    def test_merge_and_summary(self):
+        first = Profiler()
+        first.add("write", 0.002)
+        first.add_page("a.md", 0.004)
+        second = Profiler()
+        second.add("write", 0.001)
+        second.add("parse", 0.010)
+        second.add_page("b.md", 0.011)
+        first.merge(second)
+        summary = {row["stage"]: row for row in first.summary()}
+        self.assertEqual(summary["write"]["count"], 2)
+        self.assertAlmostEqual(summary["write"]["total"], 0.003)
+        self.assertEqual(summary["write"]["max"], 0.002)
+        self.assertEqual(first.slowest_pages(1), [("b.md", 0.011)])
+
+    def test_report(self):
+        profiler = Profiler()
+        profiler.add("parse", 0.010)
+        profiler.add_page("a.md", 0.012)
+        report = profiler.report()
+        self.assertIn("parse", report)
+        self.assertIn("slowest 1 page(s):", report)
+        self.assertIn("a.md", report)
+
+    def test_null_profiler(self):
+        with NULL_PROFILER.stage("parse"):
+            NULL_PROFILER.add("parse", 1.0)
+            NULL_PROFILER.add_page("a.md", 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import io
+import unittest
+
+from LeafNode import LeafNode
+from parentnode import ParentNode
+from template import Template
+
+
+class TestTemplate(unittest.TestCase):
+
+    def test_render_title_and_content(self):
+        template = Template("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        self.assertEqual(
+            template.render(Title="Home", Content="<p>hi</p>"),
+            "<title>Home</title><body><p>hi</p></body>",
+        )
+
+    def test_matches_str_replace(self):
+        text = "<h1>{{ Title }}</h1>\n{{ Content }}\n<footer>{{ Title }}</footer>"
+        expected = text.replace("{{ Title }}", "T").replace("{{ Content }}", "C")
+        self.assertEqual(Template(text).render(Title="T", Content="C"), expected)
+
+    def test_parse_chunks_and_slots(self):
+        template = Template("a{{ Title }}b{{Date}}c")
+        self.assertEqual(template.chunks, ["a", "b", "c"])
+        self.assertEqual(template.slots, ["Title", "Date"])
+        self.assertEqual(template.names, frozenset({"Title", "Date"}))
+
+    def test_extra_placeholders(self):
+        template = Template('<meta content="{{ Description }}">{{ Date }}')
+        self.assertEqual(
+            template.render({"Description": "About"}, Date="2024-12-08"),
+            '<meta content="About">2024-12-08',
+        )
+
+    def test_missing_values_are_left_verbatim(self):
+        template = Template("[{{ Date }}|{{Title}}]")
+        self.assertEqual(template.render(Title="T"), "[{{ Date }}|T]")
+        fp = io.StringIO()
+        template.write(fp, Title="T")
+        self.assertEqual(fp.getvalue(), "[{{ Date }}|T]")
+
+    def test_no_placeholders(self):
+        self.assertEqual(Template("plain").render(Title="x"), "plain")
+
+    def test_content_is_not_reinterpreted(self):
+        template = Template("{{ Title }}|{{ Content }}")
+        self.assertEqual(
+            template.render(Title="{{ Content }}", Content="c"),
+            "{{ Content }}|c",
+        )
+
+    def test_write_streams_nodes(self):
+        template = Template("<title>{{ Title }}</title>{{ Content }}")
+        node = ParentNode("div", [ParentNode("p", [LeafNode(None, "hi")])])
+        fp = io.StringIO()
+        template.write(fp, Title="Home", Content=node)
+        self.assertEqual(
+            fp.getvalue(),
+            template.render(Title="Home", Content=node.to_html()),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
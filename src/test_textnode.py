@@ -63,5 +63,17 @@ class TestTextNodeToHTMLNode(unittest.TestCase):
         self.assertEqual(html_node.tag, "b")
         self.assertEqual(html_node.value, "This is bold")
 
+    def test_link_props_are_shared(self):
+        first = text_node_to_html_node(TextNode("a", TextType.LINK, "/docs"))
+        second = text_node_to_html_node(TextNode("b", TextType.LINK, "/docs"))
+        self.assertIs(first.props, second.props)
+        self.assertEqual(first.props, {"href": "/docs"})
+        self.assertEqual(first.to_html(), '<a href="/docs">a</a>')
+        with self.assertRaises(TypeError):
+            first.props["href"] = "/other"
+
+    def test_text_node_has_no_instance_dict(self):
+        self.assertFalse(hasattr(TextNode("a", TextType.TEXT), "__dict__"))
+
 if __name__ == "__main__":
     unittest.main()
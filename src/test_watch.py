@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+import urllib.request
+
+from temptree import TempTreeTestCase
+from watch import Watcher, scan, serve
+
+
+class TestWatcher(TempTreeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.template = self.write("template.html", "{{ Content }}")
+        self.page = self.write("content/index.md", "# Home")
+
+    def test_scan_files_and_directories(self):
+        state = scan([self.content, self.template])
+        self.assertEqual(set(state), {self.page, self.template})
+
+    def test_poll_without_changes(self):
+        watcher = Watcher([self.content, self.template])
+        self.assertEqual(watcher.poll(), ([], []))
+
+    def test_poll_reports_changes(self):
+        watcher = Watcher([self.content, self.template])
+        self.write("content/index.md", "# Home, edited")
+        added = self.write("content/blog/post.md", "# Post")
+        changed, removed = watcher.poll()
+        self.assertEqual(sorted(changed), sorted([self.page, added]))
+        self.assertEqual(removed, [])
+
+    def test_poll_reports_removals(self):
+        watcher = Watcher([self.content, self.template])
+        os.remove(self.page)
+        self.assertEqual(watcher.poll(), ([], [self.page]))
+
+
+class TestServe(unittest.TestCase):
+
+    def test_serves_directory(self):
+        with tempfile.TemporaryDirectory() as root:
+            with open(os.path.join(root, "index.html"), 'w') as f:
+                f.write("<p>hello</p>")
+            server = serve(root, port=0, host="127.0.0.1")
+            try:
+                url = f"http://127.0.0.1:{server.server_port}/index.html"
+                with urllib.request.urlopen(url) as response:
+                    self.assertEqual(response.read(), b"<p>hello</p>")
+            finally:
+                server.shutdown()
+                server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+
+from writer import write_if_changed
+
+
+class TestWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "out", "index.html")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self):
+        with open(self.path) as f:
+            return f.read()
+
+    def test_write_if_changed(self):
+        self.assertTrue(write_if_changed(self.path, "<p>one</p>"))
+        self.assertEqual(self.read(), "<p>one</p>")
+        os.utime(self.path, ns=(0, 0))
+        self.assertFalse(write_if_changed(self.path, "<p>one</p>"))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 0)
+        self.assertTrue(write_if_changed(self.path, "<p>two</p>"))
+        self.assertEqual(self.read(), "<p>two</p>")
+
+    def test_write_leaves_no_temporary_files(self):
+        write_if_changed(self.path, "<p>one</p>")
+        write_if_changed(self.path, "<p>two</p>")
+        write_if_changed(self.path, "<p>two</p>")
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["index.html"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,6 @@
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
 from LeafNode import LeafNode
 
 class TextType(Enum):
@@ -10,6 +12,8 @@ class TextType(Enum):
     IMAGE = "image"
 
 class TextNode():
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url = None):
         self.text = text
         self.text_type = text_type
@@ -22,6 +26,11 @@ class TextNode():
     def __repr__(self):
         return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
 
+@lru_cache(maxsize=4096)
+def href_props(url):
+    return MappingProxyType({"href": url})
+
+
 def text_node_to_html_node(text_node):
     if text_node.text_type == TextType.TEXT:
         return LeafNode(None, text_node.text)
@@ -32,7 +41,7 @@ def text_node_to_html_node(text_node):
     if text_node.text_type == TextType.CODE:
         return LeafNode("code", text_node.text)
     if text_node.text_type == TextType.LINK:
-        return LeafNode("a", text_node.text, {"href": text_node.url})
+        return LeafNode("a", text_node.text, href_props(text_node.url))
     if text_node.text_type == TextType.IMAGE:
         return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
     raise ValueError(f"Invalid text type: {text_node.text_type}") 
@@ -0,0 +1,54 @@
+import functools
+import http.server
+import os
+import threading
+import time
+
+
+def scan(paths):
+    state = {}
+    for path in paths:
+        if os.path.isfile(path):
+            st = os.stat(path)
+            state[path] = (st.st_mtime_ns, st.st_size)
+            continue
+        for dirpath, _, filenames in os.walk(path):
+            for name in filenames:
+                file_path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(file_path)
+                except FileNotFoundError:
+                    continue
+                state[file_path] = (st.st_mtime_ns, st.st_size)
+    return state
+
+
+class Watcher():
+    def __init__(self, paths, interval=0.2):
+        self.paths = paths
+        self.interval = interval
+        self.state = scan(paths)
+
+    def poll(self):
+        state = scan(self.paths)
+        changed = [path for path, signature in state.items()
+                   if self.state.get(path) != signature]
+        removed = [path for path in self.state if path not in state]
+        self.state = state
+        return changed, removed
+
+    def run(self, callback, stop=None):
+        while stop is None or not stop.is_set():
+            time.sleep(self.interval)
+            changed, removed = self.poll()
+            if changed or removed:
+                callback(changed, removed)
+
+
+def serve(directory, port=8888, host=""):
+    handler = functools.partial(
+        http.server.SimpleHTTPRequestHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server